@@ -0,0 +1,115 @@
+"""
+Memory benchmark: bytes per simulated entity, including its abilities and status effects.
+
+Both layouts are copies of the same entities. "before" gives every object a
+per-instance __dict__ and a dict of stat modifiers, which is how Entity, Ability and
+StatusEffect were stored before they were slotted. "after" copies the slotted
+classes as they are.
+
+    python benchmarks/memory_per_entity.py --entities 100000
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.abilities.abilities import create_abilities
+from src.model.AbilityDefinition import AbilityDefinition
+from src.model.StatsModifier import StatsModifier
+from src.model.StatusEffect import StatusEffect
+from src.services.content_registry import get_registry
+from src.services.create_teams import create_enemy_wave, create_player_team
+
+
+DICT_CLASSES = {}
+
+
+def dict_class(cls):
+    """Plain class with a __dict__, standing in for the unslotted version of cls"""
+    if cls not in DICT_CLASSES:
+        DICT_CLASSES[cls] = type(f"Dict{cls.__name__}", (), {})
+    return DICT_CLASSES[cls]
+
+
+def copy_graph(obj, memo, slotted):
+    """
+    Copy an object graph, sharing whatever the source shares. With slotted=False every
+    slotted object gets a __dict__ instead, stat modifiers become dicts and ability
+    definitions become objects carrying their own cooldown, as before they were slotted.
+    """
+    if id(obj) in memo:
+        return memo[id(obj)]
+    if isinstance(obj, list):
+        copy = memo[id(obj)] = []
+        copy.extend(copy_graph(item, memo, slotted) for item in obj)
+        return copy
+    if isinstance(obj, StatsModifier) and not slotted:
+        copy = memo[id(obj)] = dict(obj.items())
+        return copy
+    if isinstance(obj, AbilityDefinition) and not slotted:
+        copy = memo[id(obj)] = dict_class(type(obj))()
+        for attr in obj._fields:
+            setattr(copy, attr, copy_graph(getattr(obj, attr), memo, slotted))
+        copy.current_cooldown = 0
+        return copy
+    if isinstance(obj, tuple):
+        items = [copy_graph(item, memo, slotted) for item in obj]
+        copy = memo[id(obj)] = type(obj)._make(items) if hasattr(obj, "_fields") else tuple(items)
+        return copy
+    if hasattr(type(obj), "__slots__") and not isinstance(obj, type):
+        copy = memo[id(obj)] = type(obj).__new__(type(obj)) if slotted else dict_class(type(obj))()
+        for cls in reversed(type(obj).__mro__):
+            for attr in getattr(cls, "__slots__", ()):
+                setattr(copy, attr, copy_graph(getattr(obj, attr), memo, slotted))
+        return copy
+    return obj
+
+
+def build_entities(count):
+    """
+    Build roughly count entities from player teams and mid-game waves, with active
+    effects. Abilities are built once from the registry and shared, as in a simulation.
+    """
+    registry = get_registry()
+    abilities = create_abilities(registry)
+    entities = []
+    wave_number = 1
+    while len(entities) < count:
+        roster = (create_player_team(abilities, registry)
+                  + create_enemy_wave(abilities, wave_number, registry=registry))
+        for entity in roster:
+            entity.add_status_effect(StatusEffect("Defense Up", 3, {"defense": 0.5}))
+            entity.add_status_effect(StatusEffect("Poison", 3, dot_damage=10))
+        entities.extend(roster)
+        wave_number = wave_number % 10 + 1
+    return entities[:count]
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return objects, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory used per entity")
+    parser.add_argument("--entities", type=int, default=20000)
+    args = parser.parse_args()
+    
+    # Both layouts are copied the same way from the same source objects, so only the layout differs
+    entities = build_entities(args.entities)
+    _, dict_bytes = measure(lambda: copy_graph(entities, {}, slotted=False))
+    _, slotted_bytes = measure(lambda: copy_graph(entities, {}, slotted=True))
+    
+    print(f"Entities: {args.entities}")
+    print(f"before (__dict__ instances): {dict_bytes / args.entities:8.1f} bytes per entity")
+    print(f"after  (__slots__ instances): {slotted_bytes / args.entities:8.1f} bytes per entity")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from src.services.outcome_cache import OutcomeCache, wave_signature
+from src.services.parallel_simulation import all_team_compositions, run_parallel_sweep
+
+DEFAULT_TEAM = ["Warrior", "Mage", "Healer", "Rogue"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless battle simulations")
+    parser.add_argument("--team", nargs="+", default=DEFAULT_TEAM, help="Names of the player characters")
+    parser.add_argument("--all-teams", action="store_true", help="Simulate every 4-character team instead of --team")
+    parser.add_argument("--waves", type=int, nargs="+", default=[1], help="Wave numbers to simulate")
+    parser.add_argument("--battles", type=int, default=1000, help="Number of battles per team and wave")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first battle")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes (0 for one per core)")
+    parser.add_argument("--engine", choices=["object", "vector"], default="object",
+                        help="Simulate with Battle objects or with the NumPy engine")
+    parser.add_argument("--cross-check", action="store_true",
+                        help="Compare the NumPy engine against the object engine")
+    parser.add_argument("--cache", help="SQLite outcome cache; team/wave/seed combinations simulated "
+                                        "before with the same content are read from it")
+    args = parser.parse_args()
+    
+    teams = all_team_compositions() if args.all_teams else [tuple(args.team)]
+    
+    if args.cross_check:
+        # NumPy is only needed for the vectorized engine
+        from src.services.vectorized_simulation import cross_check
+        for team in teams:
+            for wave_number in args.waves:
+                _, _, mismatches = cross_check(team, wave_number, args.battles, args.seed)
+                status = "MISMATCH " + "; ".join(mismatches) if mismatches else "OK"
+                print(f"{', '.join(team)} vs wave {wave_number}: {status}")
+        return
+    
+    cache = OutcomeCache(args.cache) if args.cache else None
+    seeds = range(args.seed, args.seed + args.battles)
+    if args.engine == "vector":
+        from src.services.vectorized_simulation import simulate_wave_vectorized
+        results = {}
+        for team in teams:
+            for wave_number in args.waves:
+                signature = wave_signature(team, wave_number, seeds, engine="vector")
+                result = cache.get(signature) if cache else None
+                if result is None:
+                    result = simulate_wave_vectorized(team, wave_number, args.battles, args.seed)
+                    if cache:
+                        cache.put(signature, result)
+                results[(team, wave_number)] = result
+    else:
+        results = run_parallel_sweep(teams, args.waves, seeds, workers=args.workers or None, cache=cache)
+    
+    for team in teams:
+        for wave_number in args.waves:
+            print(f"=== {', '.join(team)} vs wave {wave_number} ===")
+            print(results[(team, wave_number)])
+            print()
+    
+    if cache is not None:
+        print(f"Outcome cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
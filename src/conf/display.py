@@ -1,6 +1,14 @@
 import pygame
 from src.conf.conf import SCREEN_WIDTH, SCREEN_HEIGHT
 
-# Initialize Pygame display
-SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Turn-Based Battle Game")
+# The window is created on first use, so importing this module never opens one
+_screen = None
+
+
+def init_display() -> pygame.Surface:
+    """Create the game window if needed and return its surface"""
+    global _screen
+    if _screen is None:
+        _screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Turn-Based Battle Game")
+    return _screen
@@ -1,9 +1,29 @@
 import pygame
 
-class Fonts:
-    pygame.font.init()
-    # Fonts
-    FONT_SM = pygame.font.SysFont("Arial", 16)
-    FONT_MD = pygame.font.SysFont("Arial", 22)
-    FONT_LG = pygame.font.SysFont("Arial", 32)
-    FONT_XL = pygame.font.SysFont("Arial", 48)
\ No newline at end of file
+
+class _LazyFonts(type):
+    """Loads the fonts the first time one of them is accessed"""
+    def __getattr__(cls, name):
+        if name in cls.FONT_SPECS:
+            cls.init()
+            return type.__getattribute__(cls, name)
+        raise AttributeError(name)
+
+
+class Fonts(metaclass=_LazyFonts):
+    # Fonts: attribute name -> (family, size)
+    FONT_SPECS = {
+        "FONT_SM": ("Arial", 16),
+        "FONT_MD": ("Arial", 22),
+        "FONT_LG": ("Arial", 32),
+        "FONT_XL": ("Arial", 48),
+    }
+    
+    @classmethod
+    def init(cls) -> None:
+        """Initialize pygame.font and load every font, once"""
+        if "FONT_SM" in cls.__dict__:
+            return
+        pygame.font.init()
+        for attr, (family, size) in cls.FONT_SPECS.items():
+            setattr(cls, attr, pygame.font.SysFont(family, size))
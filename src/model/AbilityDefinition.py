@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from src.model.DamageType import DamageType
+from src.model.StatusEffect import StatusEffect
+from src.model.TargetType import TargetType
+
+
+class AbilityDefinition(NamedTuple):
+    """
+    Immutable description of an ability, shared by every entity that knows it.
+    Cooldown state lives on the entity (Entity.cooldowns), one slot per ability.
+    """
+    name: str
+    max_cooldown: int
+    damage: int = 0
+    damage_type: Optional[DamageType] = None
+    healing: int = 0
+    target_type: TargetType = TargetType.SINGLE
+    status_effect: Optional[StatusEffect] = None  # Template, copied onto each target
+    aoe_damage_reduction: float = 0.7  # AOE abilities do less damage per target
+    description: str = "No description available."
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@lru_cache(maxsize=256)
+def basic_attack(damage: int) -> AbilityDefinition:
+    """Attack used when no ability is ready, shared between every use with the same damage"""
+    return AbilityDefinition("Basic Attack", 0,
+                             damage=damage,
+                             damage_type=DamageType.PHYSICAL,
+                             target_type=TargetType.SINGLE)
@@ -0,0 +1,76 @@
+from functools import lru_cache
+from typing import NamedTuple, Sequence, Tuple
+
+from src.model.AbilityDefinition import AbilityDefinition
+from src.model.TargetType import TargetType
+
+# Target types a healing ability must have for the scripted player AI to pick it when an ally is low
+HEALING_TARGETS = (TargetType.SINGLE, TargetType.ALLIES, TargetType.ALL)
+
+# Tables have 2 ** len(abilities) entries
+MAX_ABILITIES = 12
+
+# Role flags of an ability; an ability can both deal damage and heal
+DAMAGE = 1
+HEALING = 2
+SUPPORT = 4
+
+
+def ability_roles(ability: AbilityDefinition) -> int:
+    """Role flags of an ability, the only part of it the scripted AI's partitions depend on"""
+    roles = 0
+    if ability.damage > 0:
+        roles |= DAMAGE
+    if ability.healing > 0 and ability.target_type in HEALING_TARGETS:
+        roles |= HEALING
+    if ability.damage <= 0 and ability.healing <= 0:
+        roles |= SUPPORT
+    return roles
+
+
+class ReadyAbilities(NamedTuple):
+    """Slots of the abilities of one readiness state, partitioned the way the scripted AI chooses"""
+    ready: Tuple[int, ...]
+    damage: Tuple[int, ...]
+    healing: Tuple[int, ...]
+    support: Tuple[int, ...]
+
+
+class AbilityTable:
+    """
+    Ability partitions of an ability list for every readiness bitmask.
+
+    Bit i of a mask is set when abilities[i] is off cooldown, so entries[mask] holds
+    the slots of the ready abilities split into damage, healing and support in list
+    order. The scripted AI then picks an action with one lookup and one RNG draw.
+    Tables only depend on the role flags of the abilities, so they are shared by every
+    entity whose abilities have the same roles, whatever battle or roster built them.
+    """
+    __slots__ = ("roles", "entries", "full_mask")
+
+    def __init__(self, roles: Tuple[int, ...]):
+        if len(roles) > MAX_ABILITIES:
+            raise ValueError(f"At most {MAX_ABILITIES} abilities per entity are supported")
+        self.roles = roles
+        self.full_mask = (1 << len(roles)) - 1
+        self.entries = tuple(self._partition(mask) for mask in range(self.full_mask + 1))
+
+    def _partition(self, mask: int) -> ReadyAbilities:
+        ready = tuple(i for i in range(len(self.roles)) if mask >> i & 1)
+        return ReadyAbilities(
+            ready=ready,
+            damage=tuple(i for i in ready if self.roles[i] & DAMAGE),
+            healing=tuple(i for i in ready if self.roles[i] & HEALING),
+            support=tuple(i for i in ready if self.roles[i] & SUPPORT),
+        )
+
+    @staticmethod
+    def for_abilities(abilities: Sequence[AbilityDefinition]) -> 'AbilityTable':
+        """Shared table of an ability list"""
+        return AbilityTable.for_roles(tuple([ability_roles(ability) for ability in abilities]))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def for_roles(roles: Tuple[int, ...]) -> 'AbilityTable':
+        """Shared table of a tuple of role flags"""
+        return AbilityTable(roles)
@@ -1,32 +1,46 @@
+from typing import Optional
+
 import pygame
 
 
 class Animation:
-    def __init__(self, sprite, start_pos, end_pos, duration=500):
+    def __init__(self, sprite, start_pos, end_pos, duration=500, start_time: Optional[int] = None):
+        self.reset(sprite, start_pos, end_pos, duration, start_time)
+
+    def reset(self, sprite, start_pos, end_pos, duration=500, start_time: Optional[int] = None):
+        """(Re)start the animation, so pooled instances can be reused"""
         self.sprite = sprite
         self.start_pos = start_pos
         self.end_pos = end_pos
         self.duration = duration  # in milliseconds
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = pygame.time.get_ticks() if start_time is None else start_time
         self.completed = False
-    
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        elapsed = current_time - self.start_time
-        
+
+    @property
+    def bounds(self) -> pygame.Rect:
+        """Area covered along the whole path"""
+        width, height = self.sprite.get_size()
+        start = pygame.Rect(self.start_pos, (width, height))
+        return start.union(pygame.Rect(self.end_pos, (width, height)))
+
+    def update(self, now: Optional[int] = None):
+        """Position at time now (the current time by default)"""
+        if now is None:
+            now = pygame.time.get_ticks()
+        elapsed = now - self.start_time
+
         if elapsed >= self.duration:
             self.completed = True
             return self.end_pos
-        
+
         # Calculate position based on time
         progress = elapsed / self.duration
         x = self.start_pos[0] + (self.end_pos[0] - self.start_pos[0]) * progress
         y = self.start_pos[1] + (self.end_pos[1] - self.start_pos[1]) * progress
-        
+
         return (x, y)
-    
-    def draw(self, screen):
+
+    def draw(self, screen, now: Optional[int] = None):
         if not self.completed:
-            pos = self.update()
+            pos = self.update(now)
             screen.blit(self.sprite, pos)
-
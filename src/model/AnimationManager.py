@@ -0,0 +1,88 @@
+from typing import Iterator, List, Optional, Union
+
+import pygame
+
+from src.model.Animation import Animation
+from src.model.TextAnimation import TextAnimation
+
+
+class AnimationManager:
+    """
+    Owns the projectiles and floating texts on screen.
+
+    draw() reads the clock once, advances every animation and composites them with
+    one batched blit per kind, projectiles below texts (TextAnimation.draw_all).
+    Finished animations are dropped by compacting the lists in place and go back to
+    a pool, so AOE abilities spawning hundreds of them cost no allocations or list.remove scans.
+    """
+
+    def __init__(self):
+        self.projectiles: List[Animation] = []
+        self.texts: List[TextAnimation] = []
+        self._projectile_pool: List[Animation] = []
+        self._text_pool: List[TextAnimation] = []
+
+    def __len__(self) -> int:
+        return len(self.projectiles) + len(self.texts)
+
+    def __iter__(self) -> Iterator[Union[Animation, TextAnimation]]:
+        yield from self.projectiles
+        yield from self.texts
+
+    def spawn_projectile(self, sprite, start_pos, end_pos, duration=500,
+                         now: Optional[int] = None) -> Animation:
+        if self._projectile_pool:
+            animation = self._projectile_pool.pop()
+            animation.reset(sprite, start_pos, end_pos, duration, now)
+        else:
+            animation = Animation(sprite, start_pos, end_pos, duration, now)
+        self.projectiles.append(animation)
+        return animation
+
+    def spawn_text(self, text, position, color, duration=1000, move_distance=50,
+                   now: Optional[int] = None) -> TextAnimation:
+        if self._text_pool:
+            animation = self._text_pool.pop()
+            animation.reset(text, position, color, duration, move_distance, now)
+        else:
+            animation = TextAnimation(text, position, color, duration, move_distance, now)
+        self.texts.append(animation)
+        return animation
+
+    def draw(self, screen: pygame.Surface, now: Optional[int] = None) -> None:
+        """Advance every animation to time now, draw the active ones and recycle the finished ones"""
+        if now is None:
+            now = pygame.time.get_ticks()
+        projectiles = self.projectiles
+        blits = []
+        kept = 0
+        for animation in projectiles:
+            # A projectile is still drawn at its target on the frame it arrives
+            pos = animation.update(now)
+            blits.append((animation.sprite, pos))
+            if animation.completed:
+                self._projectile_pool.append(animation)
+            else:
+                projectiles[kept] = animation
+                kept += 1
+        del projectiles[kept:]
+        if blits:
+            screen.blits(blits, doreturn=False)
+
+        texts = self.texts
+        TextAnimation.draw_all(screen, texts, now)
+        kept = 0
+        for animation in texts:
+            if animation.completed:
+                self._text_pool.append(animation)
+            else:
+                texts[kept] = animation
+                kept += 1
+        del texts[kept:]
+
+    def clear(self) -> None:
+        """Stop every animation, keeping the instances for reuse"""
+        self._projectile_pool.extend(self.projectiles)
+        self._text_pool.extend(self.texts)
+        self.projectiles.clear()
+        self.texts.clear()
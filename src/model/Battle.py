@@ -1,111 +1,358 @@
+import copy
 import time
-from typing import List, Optional, Tuple
+from typing import Callable, Iterator, List, Optional, Tuple
 import random
 
+from src.model.BattleEvent import (
+    AbilityUsedEvent, BattleEndEvent, BattleEvent, BattleStartEvent, DamageEvent, DeathEvent,
+    EffectAppliedEvent, HealEvent, ReviveEvent, RoundStartEvent, TurnOrderEvent, UnableToActEvent
+)
+from src.model.BattleLog import BattleLog
+from src.model.BattleSnapshot import BattleSnapshot
+from src.model.Observation import Action, Observation
 from src.model.EntityType import EntityType
 from src.model.Entity import Entity
-from src.model.Ability import Ability
+from src.model.AbilityDefinition import AbilityDefinition
 from src.model.DamageType import DamageType
-from src.model.StatusEffect import StatusEffect
 from src.model.TargetType import TargetType
 from src.model.Player import Player
+from src.model.TurnScheduler import TurnScheduler
 from src.model.Enemy import Enemy   
 
 class Battle:
-    def __init__(self, players: List[Player], enemies: List[Enemy], delay: float = 0.5):
+    def __init__(self, players: List[Player], enemies: List[Enemy], delay: float = 0.5,
+                 rng: Optional[random.Random] = None, seed: Optional[int] = None,
+                 record_log: bool = True, battle_log: Optional[BattleLog] = None,
+                 turn_mode: str = TurnScheduler.ROUNDS):
         self.players = players
         self.enemies = enemies
         self.turn_order: List[Entity] = []
         self.current_turn_index = 0
+        # "rounds" for speed-ordered rounds, "atb" for an initiative timeline
+        self.turn_mode = turn_mode
+        self.scheduler: Optional[TurnScheduler] = None
         self.round_number = 0
-        self.battle_log: List[str] = []
         self.delay = delay  # Delay between turns (for display purposes)
+        self.battle_started = False
         self.battle_ended = False
+        
+        # Events are kept in battle_log when record_log is set, and pushed to subscribers
+        self.battle_log = battle_log if battle_log is not None else BattleLog()
+        self.record_log = record_log
+        self.subscribers: List[Callable[[BattleEvent], None]] = []
+        
+        # Living entities per side, in roster order, kept up to date on death and revive
+        self.living = {
+            EntityType.PLAYER: [p for p in players if p.is_alive],
+            EntityType.ENEMY: [e for e in enemies if e.is_alive],
+        }
+        # Living entity with the lowest HP ratio per side, None when it must be recomputed
+        self._lowest_hp = {EntityType.PLAYER: None, EntityType.ENEMY: None}
+        
+        # Every random decision of the battle goes through this generator, so a battle
+        # can be replayed from its seed. Any object with the random.Random interface works.
+        self.rng = rng if rng is not None else random.Random(seed)
+        
+        # Aggregate statistics, used by headless simulations
+        self.turns_taken = 0
+        self.damage_dealt = {EntityType.PLAYER: 0, EntityType.ENEMY: 0}
+        self.healing_done = {EntityType.PLAYER: 0, EntityType.ENEMY: 0}
+    
+    def subscribe(self, callback: Callable[[BattleEvent], None]) -> None:
+        """Call callback with every event the battle emits from now on"""
+        self.subscribers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[BattleEvent], None]) -> None:
+        self.subscribers.remove(callback)
+    
+    def emit(self, event: BattleEvent) -> None:
+        """Record an event and push it to the subscribers"""
+        if self.record_log:
+            self.battle_log.append(event)
+        for callback in self.subscribers:
+            callback(event)
     
     def start_battle(self) -> None:
         """Initialize and start the battle"""
+        self.begin_battle()
+        
+        while not self.is_battle_over():
+            self.next_turn()
+        
+        self.end_battle()
+    
+    def events(self) -> Iterator[BattleEvent]:
+        """Run the battle to completion, yielding events as they happen"""
+        pending: List[BattleEvent] = []
+        self.subscribe(pending.append)
+        try:
+            if not self.battle_started:
+                self.begin_battle()
+            while not self.is_battle_over():
+                self.next_turn()
+                yield from pending
+                pending.clear()
+            self.end_battle()
+            yield from pending
+        finally:
+            self.unsubscribe(pending.append)
+    
+    def begin_battle(self) -> None:
+        """Calculate the first turn order"""
+        self.battle_started = True
         self.calculate_turn_order()
-        self.battle_log.append("=== Battle Start ===")
+        self.emit(BattleStartEvent())
         self.log_turn_order()
+    
+    def next_turn(self) -> Optional[AbilityUsedEvent]:
+        """
+        Process the current turn and advance to the next one,
+        starting a new round when every entity has had its turn
+        """
+        if not self.battle_started:
+            self.begin_battle()
         
-        while not self.is_battle_over():
-            self.process_turn()
-            self.current_turn_index = (self.current_turn_index + 1) % len(self.turn_order)
-            
-            # Check if we've completed a round
-            if self.current_turn_index == 0:
+        event = self.process_turn()
+        self.advance_turn()
+        return event
+    
+    def advance_turn(self) -> None:
+        """Move on to the next entity, starting a new round when every entity has had its turn"""
+        if self.turn_mode == TurnScheduler.ATB:
+            self.scheduler.advance()
+            # Rounds are fixed slices of the initiative timeline; time is infinite once
+            # nobody left has any speed
+            while (self.scheduler.time != float("inf")
+                   and self.scheduler.time >= (self.round_number + 1) * self.scheduler.round_length):
                 self.round_number += 1
-                self.battle_log.append(f"\n=== Round {self.round_number} ===")
-                self.calculate_turn_order()
-                self.log_turn_order()
+                self.emit(RoundStartEvent(self.round_number))
+            return
         
-        self.end_battle()
+        self.current_turn_index = (self.current_turn_index + 1) % len(self.turn_order)
+        
+        # Check if we've completed a round
+        if self.current_turn_index == 0:
+            self.round_number += 1
+            self.emit(RoundStartEvent(self.round_number))
+            self.calculate_turn_order()
+            self.log_turn_order()
 
     @property
     def current_entity(self) -> Optional[Entity]:
-        if not self.turn_order:
+        if self.turn_mode == TurnScheduler.ATB:
+            return self.scheduler.current_actor() if self.scheduler else None
+        if self.current_turn_index >= len(self.turn_order):
             return None
         return self.turn_order[self.current_turn_index]
 
     
-    def calculate_turn_order(self) -> None:
-        """Calculate the turn order based on speed"""
-        all_entities = []
+    def snapshot(self) -> BattleSnapshot:
+        """
+        Capture the state of the battle so restore() can rewind to it.
+        The battle log is not part of the snapshot; events stay logged after a restore.
+        """
+        return BattleSnapshot(
+            entities=tuple([(entity, entity.snapshot()) for entity in self.players + self.enemies]),
+            living=(tuple(self.living[EntityType.PLAYER]), tuple(self.living[EntityType.ENEMY])),
+            turn_order=tuple(self.turn_order),
+            current_turn_index=self.current_turn_index,
+            round_number=self.round_number,
+            battle_started=self.battle_started,
+            battle_ended=self.battle_ended,
+            scheduler=self.scheduler.snapshot() if self.scheduler is not None else None,
+            rng_state=self.rng.getstate(),
+            turns_taken=self.turns_taken,
+            damage_dealt=(self.damage_dealt[EntityType.PLAYER], self.damage_dealt[EntityType.ENEMY]),
+            healing_done=(self.healing_done[EntityType.PLAYER], self.healing_done[EntityType.ENEMY])
+        )
+    
+    def restore(self, snapshot: BattleSnapshot) -> None:
+        """Rewind the battle to a snapshot taken from this same battle"""
+        for entity, state in snapshot.entities:
+            entity.restore(state)
+        self.living = {EntityType.PLAYER: list(snapshot.living[0]), EntityType.ENEMY: list(snapshot.living[1])}
+        self._lowest_hp = {EntityType.PLAYER: None, EntityType.ENEMY: None}
+        self.turn_order = list(snapshot.turn_order)
+        self.current_turn_index = snapshot.current_turn_index
+        self.round_number = snapshot.round_number
+        self.battle_started = snapshot.battle_started
+        self.battle_ended = snapshot.battle_ended
+        if snapshot.scheduler is None:
+            self.scheduler = None
+        else:
+            if self.scheduler is None:
+                self.scheduler = TurnScheduler.__new__(TurnScheduler)
+                self.scheduler.mode = self.turn_mode
+            self.scheduler.restore(snapshot.scheduler)
+        self.rng.setstate(snapshot.rng_state)
+        self.turns_taken = snapshot.turns_taken
+        self.damage_dealt = dict(zip((EntityType.PLAYER, EntityType.ENEMY), snapshot.damage_dealt))
+        self.healing_done = dict(zip((EntityType.PLAYER, EntityType.ENEMY), snapshot.healing_done))
+    
+    def fork(self, rng: Optional[random.Random] = None, record_log: bool = False) -> 'Battle':
+        """
+        Independent copy of the battle in its current state, for "what if" lookahead.
+        Entities are cloned with Entity.clone, which shares ability definitions and base
+        stats. The fork draws from rng, or from copy.copy() of this battle's generator
+        when rng is None. It runs without delay or subscribers and, by default, without a log.
+        """
+        clones = {id(entity): entity.clone() for entity in self.players + self.enemies}
         
-        # Only include living entities
-        for entity in self.players + self.enemies:
-            if entity.is_alive:
-                all_entities.append(entity)
+        def remap(entities):
+            return [clones[id(entity)] for entity in entities]
         
-        # Sort by speed (higher speed goes first)
-        self.turn_order = sorted(all_entities, key=lambda e: e.speed, reverse=True)
+        battle = Battle.__new__(Battle)
+        battle.players = remap(self.players)
+        battle.enemies = remap(self.enemies)
+        battle.turn_order = remap(self.turn_order)
+        battle.current_turn_index = self.current_turn_index
+        battle.turn_mode = self.turn_mode
+        battle.scheduler = self.scheduler.clone(clones) if self.scheduler is not None else None
+        battle.round_number = self.round_number
+        battle.delay = 0
+        battle.battle_started = self.battle_started
+        battle.battle_ended = self.battle_ended
+        battle.battle_log = BattleLog()
+        battle.record_log = record_log
+        battle.subscribers = []
+        battle.living = {side: remap(living) for side, living in self.living.items()}
+        battle._lowest_hp = {EntityType.PLAYER: None, EntityType.ENEMY: None}
+        # Copied through the generator's own copy protocol, so any generator type forks
+        battle.rng = rng if rng is not None else copy.copy(self.rng)
+        battle.turns_taken = self.turns_taken
+        battle.damage_dealt = dict(self.damage_dealt)
+        battle.healing_done = dict(self.healing_done)
+        return battle
     
-    def process_turn(self) -> None:
-        """Process a single turn"""
-        if self.current_turn_index >= len(self.turn_order):
+    def calculate_turn_order(self) -> None:
+        """Calculate the turn order based on speed"""
+        # The scheduler keeps living entities sorted as deaths and speed changes happen
+        if self.scheduler is None:
+            self.scheduler = TurnScheduler(self.players + self.enemies, self.turn_mode)
+        self.turn_order = self.scheduler.round_order()
+    
+    def on_entity_died(self, entity: Entity) -> None:
+        """Report a death and drop the entity from the living index and turn scheduling"""
+        self.emit(DeathEvent(entity))
+        living = self.living[entity.entity_type]
+        if entity in living:
+            living.remove(entity)
+        self._lowest_hp[entity.entity_type] = None
+        if self.scheduler is not None:
+            self.scheduler.remove(entity)
+    
+    def revive_entity(self, entity: Entity, hp: int) -> None:
+        """Bring a defeated entity back with hp health"""
+        if entity.is_alive:
             return
+        entity.revive(hp)
+        roster = self.players if entity.entity_type == EntityType.PLAYER else self.enemies
+        self.living[entity.entity_type] = [e for e in roster if e.is_alive]
+        self._lowest_hp[entity.entity_type] = None
+        if self.scheduler is not None:
+            self.scheduler.add(entity)
+        self.emit(ReviveEvent(entity, entity.current_hp))
+    
+    def on_hp_changed(self, entity: Entity) -> None:
+        self._lowest_hp[entity.entity_type] = None
+    
+    def on_speed_changed(self, entity: Entity) -> None:
+        if self.scheduler is not None:
+            self.scheduler.update(entity)
+    
+    def process_turn(self) -> Optional[AbilityUsedEvent]:
+        """
+        Process a single turn
+        Returns the ability event of the turn, or None if the entity did not act
+        """
+        entity = self.begin_turn()
+        if entity is None:
+            return None
+        
+        # Select ability and targets, through the entity's policy when it has one
+        if entity.policy is not None:
+            ability, targets, slot = self.decode_action(entity, entity.policy.act(Observation(self, entity)))
+        else:
+            ability, targets, slot = entity.select_ability(self)
         
-        entity = self.turn_order[self.current_turn_index]
+        return self.finish_turn(entity, ability, targets, slot)
+    
+    def begin_turn(self) -> Optional[Entity]:
+        """
+        Start the current entity's turn: status effects tick and cooldowns go down.
+        Returns the entity when it gets to act, None otherwise
+        """
+        entity = self.current_entity
         
         # Skip if entity is no longer alive (might have died during the round)
-        if not entity.is_alive:
-            return
+        if entity is None or not entity.is_alive:
+            return None
         
         # Update status effects
-        status_messages = entity.update_status_effects(self)
-        for msg in status_messages:
-            self.battle_log.append(msg)
+        speed = entity.speed
+        if entity.status_effects:
+            for event in entity.update_status_effects(self):
+                self.emit(event)
+            self.on_hp_changed(entity)
+        if not entity.is_alive:
+            self.on_entity_died(entity)
+        elif entity.speed != speed:
+            self.on_speed_changed(entity)
         
         # Check if entity can act
         if not entity.can_act():
-            self.battle_log.append(f"{entity.name} is unable to act!")
-            return
+            self.emit(UnableToActEvent(entity))
+            return None
+        
+        self.turns_taken += 1
         
         # Reduce cooldowns
         entity.reduce_cooldowns()
-        
-        # Select ability and targets
-        ability, targets = entity.select_ability(self)
-        
-        # Execute ability
-        self.execute_ability(entity, ability, targets)
+        return entity
+    
+    def finish_turn(self, entity: Entity, ability: AbilityDefinition, targets: List[Entity],
+                    slot: int) -> AbilityUsedEvent:
+        """Carry out the action chosen for the entity that began its turn"""
+        event = self.execute_ability(entity, ability, targets, slot)
         
         # Add some delay for better readability when displaying
         if self.delay > 0:
             time.sleep(self.delay)
+        
+        return event
     
-    def execute_ability(self, caster: Entity, ability: Ability, targets: List[Entity]) -> None:
-        """Execute an ability on targets"""
+    def decode_action(self, entity: Entity, action: Action) -> Tuple[AbilityDefinition, List[Entity], int]:
+        """
+        Turn a policy's action into an ability, its targets and its slot.
+        Abilities that are unknown or on cooldown become the basic attack, and targets
+        that are missing or no longer alive are picked the way the scripted AI would.
+        """
+        if 0 <= action.ability < len(entity.abilities) and entity.cooldowns[action.ability] == 0:
+            slot = action.ability
+        else:
+            slot = -1
+        ability = entity.ability_at(slot)
+        
+        if ability.target_type == TargetType.SINGLE and action.target >= 0:
+            opponents = self.enemies if entity.entity_type == EntityType.PLAYER else self.players
+            if action.target < len(opponents) and opponents[action.target].is_alive:
+                return ability, [opponents[action.target]], slot
+        return ability, self.select_targets(entity, ability), slot
+    
+    def execute_ability(self, caster: Entity, ability: AbilityDefinition, targets: List[Entity],
+                        slot: int) -> AbilityUsedEvent:
+        """
+        Execute an ability on targets and return the ability event.
+        slot is the ability's index in the caster's ability list (-1 for the basic attack)
+        and decides which cooldown starts.
+        """
+        event = AbilityUsedEvent(caster, ability, tuple(targets))
+        self.emit(event)
         if not targets:
-            self.battle_log.append(f"{caster.name} uses {ability.name} but there are no valid targets!")
-            return
+            return event
         
         # Set ability on cooldown
-        ability.use()
-        
-        # Log ability use
-        target_names = ", ".join([t.name for t in targets])
-        self.battle_log.append(f"{caster.name} uses {ability.name} on {target_names}!")
+        caster.start_cooldown(slot)
         
         # Apply damage
         if ability.damage > 0:
@@ -129,11 +376,13 @@ class Battle:
                 
                 # Apply damage to target
                 damage_dealt = target.take_damage(actual_damage, ability.damage_type)
-                self.battle_log.append(f"{target.name} takes {damage_dealt} {ability.damage_type.value} damage!")
+                self.damage_dealt[caster.entity_type] += damage_dealt
+                self.emit(DamageEvent(target, damage_dealt, ability.damage_type))
+                self.on_hp_changed(target)
                 
                 # Check if target died
                 if not target.is_alive:
-                    self.battle_log.append(f"{target.name} has been defeated!")
+                    self.on_entity_died(target)
         
         # Apply healing
         if ability.healing > 0:
@@ -145,43 +394,40 @@ class Battle:
                         healing_amount += caster.magic_attack // 5
                     
                     amount_healed = target.heal(healing_amount)
-                    self.battle_log.append(f"{target.name} is healed for {amount_healed} HP!")
+                    self.healing_done[caster.entity_type] += amount_healed
+                    self.emit(HealEvent(target, amount_healed))
+                    self.on_hp_changed(target)
         
         # Apply status effects
         if ability.status_effect:
             for target in targets:
                 if target.is_alive:  # Only apply effects to living targets
                     # Create a new instance of the status effect for each target
-                    new_effect = StatusEffect(
-                        ability.status_effect.name,
-                        ability.status_effect.duration,
-                        ability.status_effect.stats_modifier,
-                        ability.status_effect.dot_damage,
-                        ability.status_effect.dot_type,
-                        ability.status_effect.heal_per_turn,
-                        ability.status_effect.can_act
-                    )
+                    new_effect = ability.status_effect.copy()
                     
+                    speed = target.speed
                     is_new = target.add_status_effect(new_effect)
-                    if is_new:
-                        self.battle_log.append(f"{target.name} is affected by {new_effect.name}!")
-                    else:
-                        self.battle_log.append(f"{target.name}'s {new_effect.name} is refreshed!")
+                    self.emit(EffectAppliedEvent(target, new_effect, refreshed=not is_new))
+                    if target.speed != speed:
+                        self.on_speed_changed(target)
+        
+        return event
     
-    def select_targets(self, caster: Entity, ability: Ability) -> List[Entity]:
+    def select_targets(self, caster: Entity, ability: AbilityDefinition) -> List[Entity]:
         """Select targets for an ability based on target type"""
-        enemies = self.get_living_entities(EntityType.ENEMY if caster.entity_type == EntityType.PLAYER else EntityType.PLAYER)
-        allies = self.get_living_entities(caster.entity_type)
+        enemy_type = EntityType.ENEMY if caster.entity_type == EntityType.PLAYER else EntityType.PLAYER
+        enemies = self.living[enemy_type]
+        allies = self.living[caster.entity_type]
         
         if ability.target_type == TargetType.SINGLE:
             # Target a single enemy
             if enemies:
-                return [random.choice(enemies)]
+                return [self.rng.choice(enemies)]
             return []
             
         elif ability.target_type == TargetType.ALL:
-            # Target all enemies
-            return enemies
+            # Target all enemies (a copy, the index changes as targets die)
+            return list(enemies)
             
         elif ability.target_type == TargetType.SELF:
             # Target self
@@ -189,54 +435,58 @@ class Battle:
             
         elif ability.target_type == TargetType.ALLIES:
             # Target all allies including self
-            return allies
+            return list(allies)
             
         elif ability.target_type == TargetType.RANDOM:
             # Target random enemies (1-3)
             if enemies:
-                num_targets = min(random.randint(1, 3), len(enemies))
-                return random.sample(enemies, num_targets)
+                num_targets = min(self.rng.randint(1, 3), len(enemies))
+                return self.rng.sample(enemies, num_targets)
             return []
             
         elif ability.target_type == TargetType.LOWEST_HP_ALLY:
             # Target ally with lowest HP
-            if allies:
-                return [min(allies, key=lambda e: e.current_hp / e.max_hp)]
-            return []
+            lowest = self.lowest_hp_entity(caster.entity_type)
+            return [lowest] if lowest is not None else []
             
         elif ability.target_type == TargetType.LOWEST_HP_ENEMY:
             # Target enemy with lowest HP
-            if enemies:
-                return [min(enemies, key=lambda e: e.current_hp / e.max_hp)]
-            return []
+            lowest = self.lowest_hp_entity(enemy_type)
+            return [lowest] if lowest is not None else []
             
         return []
     
     def get_living_entities(self, entity_type: EntityType) -> List[Entity]:
         """Get all living entities of a specific type"""
-        if entity_type == EntityType.PLAYER:
-            return [p for p in self.players if p.is_alive]
-        else:
-            return [e for e in self.enemies if e.is_alive]
+        return list(self.living[entity_type])
+    
+    def alive_count(self, entity_type: EntityType) -> int:
+        return len(self.living[entity_type])
+    
+    def lowest_hp_entity(self, entity_type: EntityType) -> Optional[Entity]:
+        """Living entity of a side with the lowest HP ratio, cached until HP changes on that side"""
+        lowest = self._lowest_hp[entity_type]
+        if lowest is None:
+            living = self.living[entity_type]
+            if not living:
+                return None
+            lowest = min(living, key=lambda e: e.current_hp / e.max_hp)
+            self._lowest_hp[entity_type] = lowest
+        return lowest
     
     def is_battle_over(self) -> bool:
         """Check if the battle is over"""
         if self.battle_ended:
             return True
-            
-        players_alive = any(p.is_alive for p in self.players)
-        enemies_alive = any(e.is_alive for e in self.enemies)
         
-        return not (players_alive and enemies_alive)
+        return not (self.living[EntityType.PLAYER] and self.living[EntityType.ENEMY])
     
     def get_winner(self) -> Optional[EntityType]:
         """Returns the type of the winning side, or None if battle isn't over"""
         if not self.is_battle_over():
             return None
-            
-        players_alive = any(p.is_alive for p in self.players)
         
-        if players_alive:
+        if self.living[EntityType.PLAYER]:
             return EntityType.PLAYER
         else:
             return EntityType.ENEMY
@@ -244,18 +494,11 @@ class Battle:
     def end_battle(self) -> None:
         """End the battle and announce the winner"""
         self.battle_ended = True
-        winner = self.get_winner()
-        
-        self.battle_log.append("\n=== Battle End ===")
-        if winner == EntityType.PLAYER:
-            self.battle_log.append("Players are victorious!")
-        else:
-            self.battle_log.append("Enemies are victorious!")
+        self.emit(BattleEndEvent(self.get_winner()))
     
     def log_turn_order(self) -> None:
         """Log the turn order for the current round"""
-        order_str = " → ".join([entity.name for entity in self.turn_order])
-        self.battle_log.append(f"Turn order: {order_str}\n")
+        self.emit(TurnOrderEvent(tuple(self.turn_order)))
     
     def display_battle_state(self) -> None:
         """Display the current state of the battle"""
@@ -275,6 +518,6 @@ class Battle:
     
     def print_battle_log(self) -> None:
         """Print the battle log"""
-        for entry in self.battle_log:
-            print(entry)
+        for line in self.battle_log.lines():
+            print(line)
 
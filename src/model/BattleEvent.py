@@ -0,0 +1,162 @@
+from typing import Optional, Tuple
+
+from src.model.DamageType import DamageType
+from src.model.EntityType import EntityType
+
+
+class BattleEvent:
+    """
+    Base class of the events reported by a Battle.
+    Events only keep references to the objects involved; the log message is
+    built by format() when a UI or log sink actually asks for it.
+    """
+    __slots__ = ()
+
+    def format(self) -> str:
+        raise NotImplementedError("Subclasses must implement format")
+
+    def __str__(self) -> str:
+        return self.format()
+
+
+class BattleStartEvent(BattleEvent):
+    __slots__ = ()
+
+    def format(self) -> str:
+        return "=== Battle Start ==="
+
+
+class RoundStartEvent(BattleEvent):
+    __slots__ = ("round_number",)
+
+    def __init__(self, round_number: int):
+        self.round_number = round_number
+
+    def format(self) -> str:
+        return f"\n=== Round {self.round_number} ==="
+
+
+class TurnOrderEvent(BattleEvent):
+    __slots__ = ("entities",)
+
+    def __init__(self, entities: Tuple['Entity', ...]):
+        self.entities = entities
+
+    def format(self) -> str:
+        order_str = " → ".join([entity.name for entity in self.entities])
+        return f"Turn order: {order_str}\n"
+
+
+class AbilityUsedEvent(BattleEvent):
+    __slots__ = ("entity", "ability", "targets")
+
+    def __init__(self, entity: 'Entity', ability: 'AbilityDefinition', targets: Tuple['Entity', ...]):
+        self.entity = entity
+        self.ability = ability
+        self.targets = targets
+
+    def format(self) -> str:
+        if not self.targets:
+            return f"{self.entity.name} uses {self.ability.name} but there are no valid targets!"
+        target_names = ", ".join([t.name for t in self.targets])
+        return f"{self.entity.name} uses {self.ability.name} on {target_names}!"
+
+
+class UnableToActEvent(BattleEvent):
+    __slots__ = ("entity",)
+
+    def __init__(self, entity: 'Entity'):
+        self.entity = entity
+
+    def format(self) -> str:
+        return f"{self.entity.name} is unable to act!"
+
+
+class DamageEvent(BattleEvent):
+    """Damage dealt by an ability, or by a status effect when source_effect is set"""
+    __slots__ = ("target", "amount", "damage_type", "source_effect")
+
+    def __init__(self, target: 'Entity', amount: int, damage_type: DamageType,
+                 source_effect: Optional[str] = None):
+        self.target = target
+        self.amount = amount
+        self.damage_type = damage_type
+        self.source_effect = source_effect
+
+    def format(self) -> str:
+        if self.source_effect:
+            return f"{self.target.name} takes {self.amount} {self.damage_type.value} damage from {self.source_effect}"
+        return f"{self.target.name} takes {self.amount} {self.damage_type.value} damage!"
+
+
+class HealEvent(BattleEvent):
+    """Healing done by an ability, or by a status effect when source_effect is set"""
+    __slots__ = ("target", "amount", "source_effect")
+
+    def __init__(self, target: 'Entity', amount: int, source_effect: Optional[str] = None):
+        self.target = target
+        self.amount = amount
+        self.source_effect = source_effect
+
+    def format(self) -> str:
+        if self.source_effect:
+            return f"{self.target.name} heals for {self.amount} from {self.source_effect}"
+        return f"{self.target.name} is healed for {self.amount} HP!"
+
+
+class EffectAppliedEvent(BattleEvent):
+    __slots__ = ("target", "effect", "refreshed")
+
+    def __init__(self, target: 'Entity', effect: 'StatusEffect', refreshed: bool = False):
+        self.target = target
+        self.effect = effect
+        self.refreshed = refreshed
+
+    def format(self) -> str:
+        if self.refreshed:
+            return f"{self.target.name}'s {self.effect.name} is refreshed!"
+        return f"{self.target.name} is affected by {self.effect.name}!"
+
+
+class EffectExpiredEvent(BattleEvent):
+    __slots__ = ("entity", "effect")
+
+    def __init__(self, entity: 'Entity', effect: 'StatusEffect'):
+        self.entity = entity
+        self.effect = effect
+
+    def format(self) -> str:
+        return f"{self.entity.name} is no longer affected by {self.effect.name}"
+
+
+class DeathEvent(BattleEvent):
+    __slots__ = ("entity",)
+
+    def __init__(self, entity: 'Entity'):
+        self.entity = entity
+
+    def format(self) -> str:
+        return f"{self.entity.name} has been defeated!"
+
+
+class ReviveEvent(BattleEvent):
+    __slots__ = ("entity", "hp")
+
+    def __init__(self, entity: 'Entity', hp: int):
+        self.entity = entity
+        self.hp = hp
+
+    def format(self) -> str:
+        return f"{self.entity.name} is revived with {self.hp} HP!"
+
+
+class BattleEndEvent(BattleEvent):
+    __slots__ = ("winner",)
+
+    def __init__(self, winner: Optional[EntityType]):
+        self.winner = winner
+
+    def format(self) -> str:
+        if self.winner == EntityType.PLAYER:
+            return "\n=== Battle End ===\nPlayers are victorious!"
+        return "\n=== Battle End ===\nEnemies are victorious!"
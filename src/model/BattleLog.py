@@ -0,0 +1,102 @@
+import json
+from collections import deque
+from typing import Any, Iterator, List, Optional
+
+
+class LogEntry:
+    """Log message whose template is only formatted when the entry is displayed or exported"""
+    __slots__ = ("template", "args")
+
+    def __init__(self, template: str, *args: Any):
+        self.template = template
+        self.args = args
+
+    def format(self) -> str:
+        return self.template.format(*self.args)
+
+    def __str__(self) -> str:
+        return self.format()
+
+
+class BattleLog:
+    """
+    Bounded ring buffer of log entries.
+
+    Entries can be anything with a __str__ (battle events, LogEntry, plain strings) and
+    are only converted to text when displayed or exported. Once capacity is reached the
+    oldest entry is dropped, or appended to spill_path when spilling to disk is enabled.
+    The spill file is truncated by the first spill, so it only holds this log's entries,
+    and stores each entry as one JSON string per line so multi-line entries survive.
+    """
+
+    def __init__(self, capacity: int = 1000, spill_path: Optional[str] = None):
+        if capacity <= 0:
+            raise ValueError("Log capacity must be positive")
+        self.entries: deque = deque(maxlen=capacity)
+        self.spill_path = spill_path
+        self.total_entries = 0  # Entries ever appended, including dropped ones
+        self._spill_file = None
+        self._spilled = False
+
+    @property
+    def capacity(self) -> int:
+        return self.entries.maxlen
+
+    def append(self, entry: Any) -> None:
+        if self.spill_path and len(self.entries) == self.capacity:
+            self._spill(self.entries[0])
+        self.entries.append(entry)
+        self.total_entries += 1
+
+    def _spill(self, entry: Any) -> None:
+        if self._spill_file is None:
+            # Truncate on the first spill; reopened after close() to keep appending
+            self._spill_file = open(self.spill_path, "a" if self._spilled else "w", encoding="utf-8")
+        self._spill_file.write(json.dumps(str(entry)) + "\n")
+        self._spilled = True
+
+    def tail(self, count: int) -> List[str]:
+        """Formatted text of the last count entries"""
+        start = max(0, len(self.entries) - count)
+        return [str(self.entries[i]) for i in range(start, len(self.entries))]
+
+    def lines(self) -> Iterator[str]:
+        """Formatted text of every entry still available, spilled entries first"""
+        if self._spilled:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+            with open(self.spill_path, encoding="utf-8") as spilled:
+                for line in spilled:
+                    yield json.loads(line)
+        for entry in self.entries:
+            yield str(entry)
+
+    def export(self, path: str) -> None:
+        """Write every available entry to a text file"""
+        with open(path, "w", encoding="utf-8") as out:
+            for line in self.lines():
+                out.write(f"{line}\n")
+
+    def clear(self) -> None:
+        """Drop every entry, including the ones spilled to disk"""
+        self.entries.clear()
+        if self._spilled:
+            self.close()
+            open(self.spill_path, "w").close()
+            self._spilled = False
+
+    def close(self) -> None:
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self.entries)[index]
+        return self.entries[index]
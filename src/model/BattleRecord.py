@@ -0,0 +1,34 @@
+from typing import NamedTuple, Tuple
+
+from src.model.Battle import Battle
+from src.model.EntityType import EntityType
+
+
+class BattleRecord(NamedTuple):
+    """Compact outcome of a single simulated battle"""
+    team: Tuple[str, ...]
+    wave_number: int
+    seed: int
+    player_won: bool
+    rounds: int
+    turns: int
+    player_damage: int
+    enemy_damage: int
+    player_healing: int
+    enemy_healing: int
+    
+    @classmethod
+    def from_battle(cls, battle: Battle, team: Tuple[str, ...] = (),
+                    wave_number: int = 0, seed: int = 0) -> 'BattleRecord':
+        return cls(
+            team=tuple(team),
+            wave_number=wave_number,
+            seed=seed,
+            player_won=battle.get_winner() == EntityType.PLAYER,
+            rounds=battle.round_number,
+            turns=battle.turns_taken,
+            player_damage=battle.damage_dealt[EntityType.PLAYER],
+            enemy_damage=battle.damage_dealt[EntityType.ENEMY],
+            player_healing=battle.healing_done[EntityType.PLAYER],
+            enemy_healing=battle.healing_done[EntityType.ENEMY]
+        )
@@ -0,0 +1,17 @@
+from typing import NamedTuple, Optional, Tuple
+
+
+class BattleSnapshot(NamedTuple):
+    """Mutable state of a Battle at one point in time, restored with Battle.restore"""
+    entities: Tuple[Tuple['Entity', tuple], ...]
+    living: Tuple[Tuple['Entity', ...], Tuple['Entity', ...]]
+    turn_order: Tuple['Entity', ...]
+    current_turn_index: int
+    round_number: int
+    battle_started: bool
+    battle_ended: bool
+    scheduler: Optional[tuple]
+    rng_state: tuple
+    turns_taken: int
+    damage_dealt: Tuple[int, int]
+    healing_done: Tuple[int, int]
@@ -1,13 +1,10 @@
 
 # Button class for UI elements
 import pygame
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from conf.fonts import Fonts
+from src.conf.fonts import Fonts
 from src.conf.conf import BLACK, DARK_GRAY, LIGHT_GRAY, WHITE
+from src.model.TextCache import TEXT_CACHE
 
 
 class Button:
@@ -25,7 +22,7 @@ class Button:
         pygame.draw.rect(screen, BLACK, self.rect, 2, border_radius=5)
         
         text_color = LIGHT_GRAY if self.disabled else BLACK
-        text_surf = Fonts.FONT_MD.render(self.text, True, text_color)
+        text_surf = TEXT_CACHE.render(Fonts.FONT_MD, self.text, text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
         
@@ -0,0 +1,69 @@
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+# A screen region: where it is drawn and a summary of everything that affects how it looks
+Region = Tuple[pygame.Rect, Hashable]
+
+
+class DirtyRenderer:
+    """
+    Redraws and presents only the parts of the screen that changed.
+
+    Every frame the game describes its screen as named regions. A region is dirty when
+    its rect or signature differs from the previous frame, or it appeared or disappeared.
+    The scene is then drawn clipped to the dirty area and only the dirty rects are
+    pushed to the display. A new scene, or invalidate(), repaints the whole screen. When
+    nothing changed, nothing is drawn or presented.
+    """
+
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self.regions: Dict[str, Region] = {}
+        self.scene: Optional[Hashable] = None
+        self.full_redraw = True
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+
+    def invalidate(self) -> None:
+        """Repaint everything on the next frame, e.g. after the window was uncovered"""
+        self.full_redraw = True
+
+    def dirty_rects(self, scene: Hashable, regions: Dict[str, Region]) -> List[pygame.Rect]:
+        """Rects to repaint this frame, given the scene's current regions"""
+        previous = self.regions
+        self.regions = regions
+        if self.full_redraw or scene != self.scene:
+            self.scene = scene
+            self.full_redraw = False
+            return [self.screen.get_rect()]
+
+        dirty = []
+        for name, (rect, signature) in regions.items():
+            old = previous.get(name)
+            if old is None:
+                dirty.append(rect)
+            elif old[1] != signature or old[0] != rect:
+                # Covers both where the region was and where it is now
+                dirty.append(rect.union(old[0]))
+        for name, (rect, _) in previous.items():
+            if name not in regions:
+                dirty.append(rect)
+        return dirty
+
+    def present(self, scene: Hashable, regions: Dict[str, Region], draw: Callable[[], None]) -> bool:
+        """Draw and present the dirty part of the scene; returns whether anything was drawn"""
+        rects = self.dirty_rects(scene, regions)
+        if not rects:
+            self.frames_skipped += 1
+            return False
+
+        # One drawing pass clipped to the dirty area, blits outside it cost almost nothing
+        self.screen.set_clip(rects[0].unionall(rects[1:]))
+        try:
+            draw()
+        finally:
+            self.screen.set_clip(None)
+        pygame.display.update(rects)
+        self.frames_drawn += 1
+        return True
@@ -1,50 +1,45 @@
-from typing import List, Tuple
-import random
+from typing import List
 
 from src.model.EntityType import EntityType
 from src.model.Entity import Entity
-from src.model.Ability import Ability
-from src.model.DamageType import DamageType
-from src.model.TargetType import TargetType
+from src.model.AbilityDefinition import AbilityDefinition, basic_attack
 
 
 
 class Enemy(Entity):
+    __slots__ = ("aggression",)
+    
     def __init__(self, name: str, max_hp: int, attack: int, defense: int, 
                  magic_attack: int, magic_defense: int, speed: int,
-                 abilities: List[Ability] = None, aggression: float = 0.7):
+                 abilities: List[AbilityDefinition] = None, aggression: float = 0.7):
         super().__init__(name, EntityType.ENEMY, max_hp, attack, defense, 
                          magic_attack, magic_defense, speed, abilities)
         self.aggression = aggression  # 0.0 to 1.0, higher means more aggressive
     
-    def select_ability(self, battle) -> Tuple[Ability, List[Entity]]:
+    def clone(self) -> 'Enemy':
+        clone = super().clone()
+        clone.aggression = self.aggression
+        return clone
+    
+    def default_ability(self) -> AbilityDefinition:
+        """Basic attack used when no ability is ready"""
+        return basic_attack(self.attack // 2 + 5)
+    
+    def choose_slot(self, battle) -> int:
         """
-        Enemy AI logic for selecting abilities and targets
+        Enemy AI logic for selecting abilities
         """
-        available_abilities = self.get_available_abilities()
+        choices = self.ready_abilities()
         
-        if not available_abilities:
+        if not choices.ready:
             # Default attack if no abilities are available
-            default_attack = Ability("Basic Attack", 0, 
-                                    damage=self.attack // 2 + 5,
-                                    damage_type=DamageType.PHYSICAL, 
-                                    target_type=TargetType.SINGLE)
-            ability = default_attack
+            slot = -1
+        elif battle.rng.random() < self.aggression:
+            # More aggressive: prefer damage abilities
+            slot = battle.rng.choice(choices.damage or choices.ready)
         else:
-            # Random choice but weighted by aggression
-            if random.random() < self.aggression:
-                # More aggressive: prefer damage abilities
-                damage_abilities = [a for a in available_abilities if a.damage > 0]
-                if damage_abilities:
-                    ability = random.choice(damage_abilities)
-                else:
-                    ability = random.choice(available_abilities)
-            else:
-                # Less aggressive: might choose support abilities
-                ability = random.choice(available_abilities)
-        
-        # Select appropriate targets based on ability type
-        targets = battle.select_targets(self, ability)
+            # Less aggressive: might choose support abilities
+            slot = battle.rng.choice(choices.ready)
         
-        return ability, targets
+        return slot
 
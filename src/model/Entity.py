@@ -1,16 +1,26 @@
 from typing import List, Tuple
 
-from src.model.Ability import Ability
+from src.model.AbilityDefinition import AbilityDefinition
+from src.model.AbilityTable import AbilityTable, ReadyAbilities
+from src.model.BattleEvent import BattleEvent, EffectExpiredEvent
 from src.model.DamageType import DamageType
 from src.model.EntityType import EntityType
 from src.model.StatusEffect import StatusEffect
 
 
 class Entity:
+    __slots__ = (
+        "name", "entity_type", "max_hp",
+        "base_attack", "base_defense", "base_magic_attack", "base_magic_defense", "base_speed",
+        "current_hp", "abilities", "cooldowns", "ability_table", "ready_mask",
+        "status_effects", "is_alive", "policy",
+        "_attack", "_defense", "_magic_attack", "_magic_defense", "_speed", "_can_act",
+    )
+    
     def __init__(self, name: str, entity_type: EntityType, 
                  max_hp: int, attack: int, defense: int, 
                  magic_attack: int, magic_defense: int, speed: int,
-                 abilities: List[Ability] = None):
+                 abilities: List[AbilityDefinition] = None):
         self.name = name
         self.entity_type = entity_type
         
@@ -25,61 +35,122 @@ class Entity:
         # Current Stats (can be modified by status effects)
         self.current_hp = max_hp
         
-        # Initialize abilities
+        # Initialize abilities; cooldowns[i] is the remaining cooldown of abilities[i]
         self.abilities = abilities or []
+        self.cooldowns: List[int] = [0] * len(self.abilities)
+        # Precomputed ability partitions, indexed by the bitmask of abilities off cooldown
+        self.ability_table = AbilityTable.for_abilities(self.abilities)
+        self.ready_mask = self.ability_table.full_mask
         
         # Status effects
         self.status_effects: List[StatusEffect] = []
         
         # State
         self.is_alive = True
+        
+        # Decision maker used instead of select_ability when set, e.g. a SearchPolicy
+        self.policy = None
+        
+        # Stats after status effect modifiers, cached until effects change
+        self.recalculate_stats()
+    
+    def snapshot(self) -> tuple:
+        """Mutable state of the entity: HP, alive flag, cooldowns and effects with their durations"""
+        return (self.current_hp, self.is_alive, tuple(self.cooldowns),
+                tuple([(effect, effect.duration) for effect in self.status_effects]))
+    
+    def restore(self, state: tuple) -> None:
+        """Return to a state taken with snapshot()"""
+        self.current_hp, self.is_alive, cooldowns, effects = state
+        self.cooldowns[:] = cooldowns
+        self.ready_mask = sum(1 << i for i, remaining in enumerate(cooldowns) if remaining == 0)
+        self.status_effects[:] = [effect for effect, _ in effects]
+        for effect, duration in effects:
+            effect.duration = duration
+        self.recalculate_stats()
+    
+    def clone(self) -> 'Entity':
+        """
+        Copy of the entity for a forked battle. Ability definitions and base stats are
+        shared; cooldowns and status effects, the only parts a battle mutates, are copied.
+        """
+        clone = type(self).__new__(type(self))
+        clone.name = self.name
+        clone.entity_type = self.entity_type
+        clone.max_hp = self.max_hp
+        clone.base_attack = self.base_attack
+        clone.base_defense = self.base_defense
+        clone.base_magic_attack = self.base_magic_attack
+        clone.base_magic_defense = self.base_magic_defense
+        clone.base_speed = self.base_speed
+        clone.current_hp = self.current_hp
+        clone.abilities = self.abilities
+        clone.cooldowns = self.cooldowns.copy()
+        clone.ability_table = self.ability_table
+        clone.ready_mask = self.ready_mask
+        clone.status_effects = [effect.copy() for effect in self.status_effects]
+        clone.is_alive = self.is_alive
+        clone._attack = self._attack
+        clone._defense = self._defense
+        clone._magic_attack = self._magic_attack
+        clone._magic_defense = self._magic_defense
+        clone._speed = self._speed
+        clone._can_act = self._can_act
+        clone.policy = None  # Forks play out with the scripted AI
+        return clone
+    
+    def recalculate_stats(self) -> None:
+        """
+        Recompute the stats after status effect modifiers.
+        Called whenever status effects are added or removed; call it manually
+        after changing base stats or the status_effects list directly.
+        """
+        attack = defense = magic_attack = magic_defense = speed = 1.0
+        can_act = True
+        for effect in self.status_effects:
+            modifier = effect.stats_modifier
+            attack += modifier.attack
+            defense += modifier.defense
+            magic_attack += modifier.magic_attack
+            magic_defense += modifier.magic_defense
+            speed += modifier.speed
+            can_act = can_act and effect.can_act
+        
+        self._attack = max(int(self.base_attack * attack), 0)
+        self._defense = max(int(self.base_defense * defense), 0)
+        self._magic_attack = max(int(self.base_magic_attack * magic_attack), 0)
+        self._magic_defense = max(int(self.base_magic_defense * magic_defense), 0)
+        self._speed = max(int(self.base_speed * speed), 0)
+        self._can_act = can_act
     
     @property
     def attack(self) -> int:
         """Get attack value after applying status effect modifiers"""
-        modifier = 1.0
-        for effect in self.status_effects:
-            modifier += effect.stats_modifier.get("attack", 0)
-        return max(int(self.base_attack * modifier), 0)
+        return self._attack
     
     @property
     def defense(self) -> int:
         """Get defense value after applying status effect modifiers"""
-        modifier = 1.0
-        for effect in self.status_effects:
-            modifier += effect.stats_modifier.get("defense", 0)
-        return max(int(self.base_defense * modifier), 0)
+        return self._defense
     
     @property
     def magic_attack(self) -> int:
         """Get magic attack value after applying status effect modifiers"""
-        modifier = 1.0
-        for effect in self.status_effects:
-            modifier += effect.stats_modifier.get("magic_attack", 0)
-        return max(int(self.base_magic_attack * modifier), 0)
+        return self._magic_attack
     
     @property
     def magic_defense(self) -> int:
         """Get magic defense value after applying status effect modifiers"""
-        modifier = 1.0
-        for effect in self.status_effects:
-            modifier += effect.stats_modifier.get("magic_defense", 0)
-        return max(int(self.base_magic_defense * modifier), 0)
+        return self._magic_defense
     
     @property
     def speed(self) -> int:
         """Get speed value after applying status effect modifiers"""
-        modifier = 1.0
-        for effect in self.status_effects:
-            modifier += effect.stats_modifier.get("speed", 0)
-        return max(int(self.base_speed * modifier), 0)
+        return self._speed
     
     def can_act(self) -> bool:
         """Check if entity can act based on status effects"""
-        for effect in self.status_effects:
-            if not effect.can_act:
-                return False
-        return True
+        return self._can_act
     
     def heal(self, amount: int) -> int:
         """Heal entity and return the amount healed"""
@@ -91,6 +162,11 @@ class Entity:
         healed = self.current_hp - before
         return healed
     
+    def revive(self, hp: int) -> None:
+        """Bring a defeated entity back to life with the given health"""
+        self.is_alive = True
+        self.current_hp = max(1, min(hp, self.max_hp))
+    
     def take_damage(self, damage: int, damage_type: DamageType) -> int:
         """
         Entity takes damage and returns the actual damage dealt
@@ -100,9 +176,9 @@ class Entity:
         
         # Calculate damage reduction based on defense
         if damage_type == DamageType.PHYSICAL:
-            reduction = self.defense / (self.defense + 100)  # Defense formula
+            reduction = self._defense / (self._defense + 100)  # Defense formula
         elif damage_type == DamageType.MAGICAL:
-            reduction = self.magic_defense / (self.magic_defense + 100)  # Magic defense formula
+            reduction = self._magic_defense / (self._magic_defense + 100)  # Magic defense formula
         else:  # TRUE damage
             reduction = 0
         
@@ -123,50 +199,89 @@ class Entity:
             if existing.name == effect.name:
                 # Refresh the duration
                 self.status_effects[i] = effect
+                self.recalculate_stats()
                 return False
         
         # Add new effect
         self.status_effects.append(effect)
+        self.recalculate_stats()
         return True
     
-    def update_status_effects(self, battle) -> List[str]:
+    def update_status_effects(self, battle) -> List[BattleEvent]:
         """
         Update status effects at the beginning of entity's turn
-        Returns a list of effect messages
+        Returns a list of battle events
         """
-        messages = []
+        events = []
         
-        # Apply effects and collect messages
+        # Apply effects and collect events
         for effect in self.status_effects[:]:  # Create a copy for safe iteration
-            effect_messages = effect.apply_turn_effects(self, battle)
-            messages.extend(effect_messages)
+            events.extend(effect.apply_turn_effects(self, battle))
             
             # Remove expired effects
             if effect.duration <= 0:
                 self.status_effects.remove(effect)
-                messages.append(f"{self.name} is no longer affected by {effect.name}")
+                self.recalculate_stats()
+                events.append(EffectExpiredEvent(self, effect))
         
-        return messages
+        return events
     
     def reduce_cooldowns(self) -> None:
         """Reduce cooldowns for all abilities"""
-        for ability in self.abilities:
-            ability.reduce_cooldown()
+        cooldowns = self.cooldowns
+        for i, remaining in enumerate(cooldowns):
+            if remaining:
+                cooldowns[i] = remaining - 1
+                if remaining == 1:
+                    self.ready_mask |= 1 << i
+    
+    def start_cooldown(self, slot: int) -> None:
+        """
+        Put the ability in a slot on cooldown after it was used. The slot identifies the
+        ability even when the list holds equal definitions; -1 (the basic attack) has none.
+        """
+        if slot >= 0:
+            cooldown = self.abilities[slot].max_cooldown
+            if cooldown > 0:
+                self.cooldowns[slot] = cooldown
+                self.ready_mask &= ~(1 << slot)
     
-    def select_ability(self, battle) -> Tuple[Ability, List['Entity']]:
+    def ability_at(self, slot: int) -> AbilityDefinition:
+        """Ability in a slot of the ability list, or the basic attack for slot -1"""
+        return self.abilities[slot] if slot >= 0 else self.default_ability()
+    
+    def select_ability(self, battle) -> Tuple[AbilityDefinition, List['Entity'], int]:
         """
-        Select an ability and targets - to be overridden by subclasses
-        Returns the selected ability and a list of targets
+        Select an ability and targets with the scripted AI
+        Returns the selected ability, a list of targets and the ability's slot
         """
-        raise NotImplementedError("Subclasses must implement select_ability")
+        slot = self.choose_slot(battle)
+        ability = self.ability_at(slot)
+        return ability, battle.select_targets(self, ability), slot
+    
+    def choose_slot(self, battle) -> int:
+        """Pick the slot of the ability to use this turn, -1 for the basic attack - to be overridden by subclasses"""
+        raise NotImplementedError("Subclasses must implement choose_slot")
     
-    def get_available_abilities(self) -> List[Ability]:
+    def default_ability(self) -> AbilityDefinition:
+        """Ability used when nothing else is ready - to be overridden by subclasses"""
+        raise NotImplementedError("Subclasses must implement default_ability")
+    
+    def get_available_abilities(self) -> List[AbilityDefinition]:
         """Get list of abilities that are ready to use"""
-        return [ability for ability in self.abilities if ability.is_ready()]
+        return [self.abilities[i] for i in self.ability_table.entries[self.ready_mask].ready]
+    
+    def ready_abilities(self) -> ReadyAbilities:
+        """Slots of the abilities off cooldown, partitioned into damage, healing and support"""
+        return self.ability_table.entries[self.ready_mask]
     
     def get_stats_display(self) -> str:
         """Get a formatted string of the entity's stats"""
         status_effects_str = ", ".join(str(effect) for effect in self.status_effects) if self.status_effects else "None"
+        abilities_str = ", ".join(
+            f"{ability.name} [{'Ready' if remaining == 0 else f'Cooldown: {remaining}'}]"
+            for ability, remaining in zip(self.abilities, self.cooldowns)
+        )
         
         return (
             f"{self.name} ({self.entity_type.value}):\n"
@@ -175,5 +290,6 @@ class Entity:
             f"MAG: {self.magic_attack} | MDEF: {self.magic_defense}\n"
             f"SPD: {self.speed}\n"
             f"Status: {status_effects_str}\n"
-            f"Abilities: {', '.join(str(ability) for ability in self.abilities)}"
+            f"Abilities: {abilities_str}"
         )
+
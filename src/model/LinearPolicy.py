@@ -0,0 +1,82 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from src.model.Observation import (
+    ABILITY_FEATURES, ABILITY_SLOTS, ENTITY_FEATURES, FEATURE_SIZE, MAX_ALLIES, MAX_OPPONENTS,
+    Action, Observation
+)
+from src.model.Policy import Policy
+
+# Feature columns the action masks are read from
+READY_COLUMNS = slice(2, 2 + ABILITY_SLOTS * ABILITY_FEATURES, ABILITY_FEATURES)
+OPPONENTS_START = 2 + ABILITY_SLOTS * ABILITY_FEATURES + MAX_ALLIES * ENTITY_FEATURES
+OPPONENT_ALIVE_COLUMNS = slice(OPPONENTS_START + 1, OPPONENTS_START + MAX_OPPONENTS * ENTITY_FEATURES,
+                               ENTITY_FEATURES)
+
+
+class LinearPolicy(Policy):
+    """
+    Linear policy over observation features, evaluated with NumPy.
+
+    ability_weights maps the features to a score for each ability slot plus the basic
+    attack (last column); target_weights maps them to a score per opponent slot. Illegal
+    choices (abilities on cooldown, dead opponents) are masked out. With temperature 0
+    the best-scoring choice is taken, otherwise choices are sampled from a softmax.
+
+    act_batch scores every observation with one matrix product, whichever battles they
+    come from, which is what makes batched self-play cheap.
+    """
+
+    def __init__(self, ability_weights: np.ndarray, target_weights: np.ndarray,
+                 temperature: float = 0.0, seed: Optional[int] = None):
+        if ability_weights.shape != (FEATURE_SIZE, ABILITY_SLOTS + 1):
+            raise ValueError(f"ability_weights must have shape {(FEATURE_SIZE, ABILITY_SLOTS + 1)}")
+        if target_weights.shape != (FEATURE_SIZE, MAX_OPPONENTS):
+            raise ValueError(f"target_weights must have shape {(FEATURE_SIZE, MAX_OPPONENTS)}")
+        self.ability_weights = ability_weights
+        self.target_weights = target_weights
+        self.temperature = temperature
+        self.np_rng = np.random.default_rng(seed)
+
+    @classmethod
+    def random(cls, seed: Optional[int] = None, scale: float = 0.1, temperature: float = 0.0) -> 'LinearPolicy':
+        """Policy with normally distributed weights, e.g. as a starting point for training"""
+        rng = np.random.default_rng(seed)
+        return cls(rng.normal(0, scale, (FEATURE_SIZE, ABILITY_SLOTS + 1)),
+                   rng.normal(0, scale, (FEATURE_SIZE, MAX_OPPONENTS)),
+                   temperature=temperature, seed=seed)
+
+    def act(self, observation: Observation) -> Action:
+        return self.act_batch([observation])[0]
+
+    def act_batch(self, observations: Sequence[Observation]) -> List[Action]:
+        if not observations:
+            return []
+        features = np.array([observation.features() for observation in observations])
+        return self.act_features(features)
+
+    def act_features(self, features: np.ndarray) -> List[Action]:
+        """Decide from an (n, FEATURE_SIZE) array of observation features"""
+        n = features.shape[0]
+        ability_legal = np.concatenate([features[:, READY_COLUMNS] > 0, np.ones((n, 1), dtype=bool)], axis=1)
+        abilities = self._choose(features @ self.ability_weights, ability_legal)
+        target_legal = features[:, OPPONENT_ALIVE_COLUMNS] > 0
+        targets = self._choose(features @ self.target_weights, target_legal)
+        abilities = np.where(abilities == ABILITY_SLOTS, -1, abilities)
+        return [Action(int(a), int(t)) for a, t in zip(abilities, targets)]
+
+    def _choose(self, scores: np.ndarray, legal: np.ndarray) -> np.ndarray:
+        """Best (or sampled) legal column per row, -1 for rows without a legal column"""
+        scores = np.where(legal, scores, -np.inf)
+        if self.temperature > 0:
+            best = scores.max(axis=1, keepdims=True, initial=-np.inf, where=legal)
+            with np.errstate(invalid="ignore"):
+                weights = np.where(legal, np.exp((scores - best) / self.temperature), 0.0)
+            totals = weights.sum(axis=1, keepdims=True)
+            cumulative = np.cumsum(weights, axis=1)
+            draws = self.np_rng.random((scores.shape[0], 1)) * totals
+            chosen = (cumulative > draws).argmax(axis=1)
+        else:
+            chosen = scores.argmax(axis=1)
+        return np.where(legal.any(axis=1), chosen, -1)
@@ -0,0 +1,92 @@
+from typing import List, NamedTuple, Optional
+
+from src.model.EntityType import EntityType
+from src.model.TargetType import TargetType
+
+# Fixed observation layout; larger rosters are truncated, smaller ones zero-padded
+ABILITY_SLOTS = 8
+MAX_ALLIES = 6
+MAX_OPPONENTS = 16
+ABILITY_FEATURES = 4  # ready, damage, healing, hits several targets
+ENTITY_FEATURES = 5  # HP share, alive, attack, defense, speed
+FEATURE_SIZE = 2 + ABILITY_SLOTS * ABILITY_FEATURES + (MAX_ALLIES + MAX_OPPONENTS) * ENTITY_FEATURES
+
+# Stats and ability numbers are divided by this to keep features around 0-1
+SCALE = 100.0
+
+MULTI_TARGETS = (TargetType.ALL, TargetType.ALLIES, TargetType.RANDOM)
+
+# Zero blocks that pad the ability and roster sections, indexed by the number of slots in use
+ABILITY_PADDING = [(0.0,) * (ABILITY_FEATURES * (ABILITY_SLOTS - used)) for used in range(ABILITY_SLOTS + 1)]
+ALLY_PADDING = [(0.0,) * (ENTITY_FEATURES * (MAX_ALLIES - used)) for used in range(MAX_ALLIES + 1)]
+OPPONENT_PADDING = [(0.0,) * (ENTITY_FEATURES * (MAX_OPPONENTS - used)) for used in range(MAX_OPPONENTS + 1)]
+
+
+class Action(NamedTuple):
+    """
+    Choice of a policy: ability is an index into the entity's abilities, or -1 for the
+    basic attack; target is an index into the opposing roster, or -1 to let the battle
+    pick targets the way the scripted AI does. Only single-target abilities use target.
+    """
+    ability: int = -1
+    target: int = -1
+
+
+class Observation:
+    """
+    What a policy sees when an entity has to act.
+
+    features() is a fixed-size vector, computed on first use: a bias, the actor's HP
+    share, ABILITY_SLOTS ability blocks, then MAX_ALLIES ally blocks and MAX_OPPONENTS
+    opponent blocks in roster order. Policies that need the whole battle, such as
+    lookahead search, can use battle and entity directly.
+    """
+    __slots__ = ("battle", "entity", "_features")
+
+    def __init__(self, battle: 'Battle', entity: 'Entity'):
+        self.battle = battle
+        self.entity = entity
+        self._features: Optional[List[float]] = None
+
+    @property
+    def allies(self) -> List['Entity']:
+        return self.battle.players if self.entity.entity_type == EntityType.PLAYER else self.battle.enemies
+
+    @property
+    def opponents(self) -> List['Entity']:
+        return self.battle.enemies if self.entity.entity_type == EntityType.PLAYER else self.battle.players
+
+    def legal_abilities(self) -> List[int]:
+        """Indices of the abilities off cooldown, or [-1] (basic attack) when none is"""
+        ready = [i for i, remaining in enumerate(self.entity.cooldowns) if remaining == 0]
+        return ready or [-1]
+
+    def features(self) -> List[float]:
+        if self._features is None:
+            self._features = self._build_features()
+        return self._features
+
+    def _build_features(self) -> List[float]:
+        entity = self.entity
+        features = [1.0, entity.current_hp / entity.max_hp]
+
+        abilities = entity.abilities[:ABILITY_SLOTS]
+        cooldowns = entity.cooldowns
+        for i, ability in enumerate(abilities):
+            features += (0.0 if cooldowns[i] else 1.0,
+                         ability.damage / SCALE,
+                         ability.healing / SCALE,
+                         1.0 if ability.target_type in MULTI_TARGETS else 0.0)
+        features += ABILITY_PADDING[len(abilities)]
+
+        for roster, size, padding in ((self.allies, MAX_ALLIES, ALLY_PADDING),
+                                      (self.opponents, MAX_OPPONENTS, OPPONENT_PADDING)):
+            shown = roster[:size]
+            for other in shown:
+                features += (other.current_hp / other.max_hp,
+                             1.0 if other.is_alive else 0.0,
+                             other.attack / SCALE,
+                             other.defense / SCALE,
+                             other.speed / SCALE)
+            features += padding[len(shown)]
+        return features
@@ -0,0 +1,121 @@
+import multiprocessing
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.model.Observation import FEATURE_SIZE
+from src.model.Policy import Policy
+from src.model.VectorEnv import VectorEnv
+
+
+def run_env_worker(connection, num_envs: int, team: Tuple[str, ...], wave_number: int, seed: int,
+                   seed_step: int, opponent_policy: Optional[Policy], max_turns: int) -> None:
+    """Worker entry point: serve reset/step/action_masks calls on one VectorEnv shard"""
+    env = VectorEnv(num_envs, team, wave_number, seed, opponent_policy, max_turns, seed_step)
+    while True:
+        command, argument = connection.recv()
+        if command == "reset":
+            connection.send(env.reset())
+        elif command == "step":
+            connection.send(env.step(argument))
+        elif command == "action_masks":
+            connection.send(env.action_masks())
+        elif command == "close":
+            connection.close()
+            return
+
+
+class ParallelVectorEnv:
+    """
+    VectorEnv with its environments sharded across worker processes.
+
+    Same interface as VectorEnv. Each worker steps its own VectorEnv over a contiguous
+    block of environments, so a step runs every shard concurrently and the aggregate
+    throughput grows with the number of cores. Shard i seeds its battles with
+    seed + i, seed + i + workers, ..., so no two shards ever play the same battle.
+    With a single worker the environments run in this process.
+    """
+
+    def __init__(self, num_envs: int, team: Sequence[str], wave_number: int, seed: int = 0,
+                 opponent_policy: Optional[Policy] = None, max_turns: int = 500,
+                 workers: Optional[int] = None):
+        self.num_envs = num_envs
+        workers = min(workers or os.cpu_count() or 1, num_envs)
+        # Spread the environments as evenly as possible, the first shards take the remainder
+        self.shard_sizes = [num_envs // workers + (i < num_envs % workers) for i in range(workers)]
+        self.local: Optional[VectorEnv] = None
+        self.connections = []
+        self.processes = []
+        if workers == 1:
+            self.local = VectorEnv(num_envs, team, wave_number, seed, opponent_policy, max_turns)
+            return
+        for i, size in enumerate(self.shard_sizes):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_env_worker,
+                args=(child, size, tuple(team), wave_number, seed + i, workers, opponent_policy, max_turns),
+                daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    @property
+    def observation_shape(self) -> Tuple[int]:
+        return (FEATURE_SIZE,)
+
+    @property
+    def action_shape(self) -> Tuple[int]:
+        return (2,)
+
+    def reset(self) -> np.ndarray:
+        """Start a new battle in every environment and return the first observations"""
+        if self.local is not None:
+            return self.local.reset()
+        return np.concatenate(self._call_all("reset"))
+
+    def step(self, actions: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """Play one action per environment and advance every shard, see VectorEnv.step"""
+        if self.local is not None:
+            return self.local.step(actions)
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 2)
+        bounds = np.cumsum([0] + self.shard_sizes)
+        results = self._call_all("step", [actions[start:stop] for start, stop in zip(bounds, bounds[1:])])
+        infos: List[Dict[str, Any]] = []
+        for result in results:
+            infos.extend(result[3])
+        return (np.concatenate([result[0] for result in results]),
+                np.concatenate([result[1] for result in results]),
+                np.concatenate([result[2] for result in results]),
+                infos)
+
+    def action_masks(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Legal ability slots and living opponent slots per environment, see VectorEnv.action_masks"""
+        if self.local is not None:
+            return self.local.action_masks()
+        results = self._call_all("action_masks")
+        return (np.concatenate([result[0] for result in results]),
+                np.concatenate([result[1] for result in results]))
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        for connection in self.connections:
+            connection.send(("close", None))
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+    def __enter__(self) -> 'ParallelVectorEnv':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _call_all(self, command: str, arguments: Optional[List[Any]] = None) -> List[Any]:
+        # Send to every worker first so the shards run concurrently, then gather in order
+        for i, connection in enumerate(self.connections):
+            connection.send((command, None if arguments is None else arguments[i]))
+        return [connection.recv() for connection in self.connections]
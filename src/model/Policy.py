@@ -0,0 +1,28 @@
+from typing import List, Sequence
+
+from src.model.Observation import Action, Observation
+
+
+class Policy:
+    """
+    Decides what an entity does on its turn.
+
+    Assign a policy to entity.policy and the battle calls act() with an Observation
+    instead of the entity's scripted select_ability. act_batch() decides for many
+    observations at once, from one battle or many; policies that can vectorize their
+    evaluation override it.
+    """
+
+    def act(self, observation: Observation) -> Action:
+        raise NotImplementedError("Subclasses must implement act")
+
+    def act_batch(self, observations: Sequence[Observation]) -> List[Action]:
+        return [self.act(observation) for observation in observations]
+
+
+class ScriptedPolicy(Policy):
+    """The built-in Player/Enemy heuristics behind the policy interface"""
+
+    def act(self, observation: Observation) -> Action:
+        # Targets are left to the battle, which picks them exactly like the scripted AI
+        return Action(observation.entity.choose_slot(observation.battle))
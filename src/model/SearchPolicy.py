@@ -0,0 +1,201 @@
+import math
+import random
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.model.EntityType import EntityType
+from src.model.Observation import Action, Observation
+from src.model.Policy import Policy
+from src.model.TargetType import TargetType
+
+# Value of a won (or lost, negated) battle; unfinished battles score the HP difference in [-1, 1]
+WIN_VALUE = 2.0
+
+
+class SearchPolicy(Policy):
+    """
+    Lookahead AI that picks an ability and its targets by simulating them forward.
+
+    Every candidate action (each ready ability, and each target for single-target
+    abilities) is tried on a fork of the battle, which then plays on with the scripted
+    AI for horizon turns (one round by default). Candidates are first scored by the state
+    right after their action, which is cheap and orders them, then sampled with UCB1
+    (best-scored first) until the wall-clock budget or rollout budget runs out, and the
+    one with the best average outcome for the acting side is used. Both passes stop at
+    the budget; without any rollout the best-scored candidate is used.
+
+    Candidates whose targets are not random always lead to the same state, so rollout
+    results are accumulated per resulting state in a bounded transposition table, which
+    also merges candidates that lead to identical states. The table only lives for one
+    decision: state keys do not identify the battle, so statistics gathered in another
+    battle or an earlier turn must not leak into the choice.
+
+    Assign an instance to entity.policy to let the battle use it for that entity.
+    Search needs the live battle, so act_batch simply decides one observation at a time.
+    """
+
+    def __init__(self, time_budget: float = 0.005, max_rollouts: Optional[int] = None,
+                 horizon: Optional[int] = None, exploration: float = 1.4,
+                 seed: Optional[int] = None, cache_size: int = 4096):
+        self.time_budget = time_budget  # Seconds per decision
+        self.max_rollouts = max_rollouts
+        self.horizon = horizon
+        self.exploration = exploration
+        # Rollouts draw from their own generator so searching never shifts the battle's RNG
+        self.rng = random.Random(seed)
+        self.cache_size = cache_size
+        self.transpositions: "OrderedDict[tuple, List[float]]" = OrderedDict()
+        self.last_rollouts = 0
+        self.rollout_cost = 0.0
+
+    def act(self, observation: Observation) -> Action:
+        entity, battle = observation.entity, observation.battle
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        candidates = self.candidates(entity, battle)
+        self.transpositions.clear()
+
+        visits = [0] * len(candidates)
+        totals = [0.0] * len(candidates)
+        keys: List[Optional[tuple]] = [None] * len(candidates)
+        rollouts = 0
+        if len(candidates) > 1:
+            caster_index = (battle.players + battle.enemies).index(entity)
+            # Value right after each action, before any reply: cheap, and decides which
+            # candidates get rollouts first when the budget cannot cover them all. They count
+            # against the budget too: candidates left unscored when time runs out go last
+            priors = [-math.inf] * len(candidates)
+            now = time.perf_counter()
+            longest = 0.0
+            for i, candidate in enumerate(candidates):
+                if i and now + longest >= deadline:
+                    break
+                priors[i] = self.rollout(battle, caster_index, candidate, horizon=0)[1]
+                previous, now = now, time.perf_counter()
+                longest = max(longest, now - previous)
+            order = sorted(range(len(candidates)), key=lambda i: -priors[i])
+            longest = 0.0
+            while self.max_rollouts is None or rollouts < self.max_rollouts:
+                # Stop when another rollout as long as the longest so far would overrun the budget
+                if now + max(longest, self.rollout_cost) >= deadline:
+                    break
+                i = self._pick(visits, totals, keys, rollouts, order)
+                key, value = self.rollout(battle, caster_index, candidates[i], deadline=deadline)
+                previous, now = now, time.perf_counter()
+                if value is None:
+                    # Cut off by the deadline; a partial rollout would bias the average
+                    break
+                rollouts += 1
+                longest = max(longest, now - previous)
+                visits[i] += 1
+                totals[i] += value
+                if key is not None:
+                    keys[i] = key
+                    self._record(key, value)
+        self.last_rollouts = rollouts
+        if rollouts:
+            # Running estimate of a rollout's duration, used to budget the next decision's first one
+            self.rollout_cost = 0.8 * self.rollout_cost + 0.2 * (now - start) / rollouts
+        else:
+            # Decay an estimate inflated by one slow stretch, so it cannot shut search off for good
+            self.rollout_cost *= 0.5
+        if len(candidates) > 1 and rollouts == 0:
+            # Out of time before the first rollout: the best action on its immediate effect
+            return candidates[order[0]]
+
+        return candidates[max(range(len(candidates)), key=lambda i: self._mean(i, visits, totals, keys))]
+
+    def candidates(self, entity: 'Entity', battle: 'Battle') -> List[Action]:
+        """Every distinct action the entity can take this turn"""
+        ready = [i for i, remaining in enumerate(entity.cooldowns) if remaining == 0]
+        opponents = battle.enemies if entity.entity_type == EntityType.PLAYER else battle.players
+        candidates: List[Action] = []
+        for index in ready or [-1]:
+            ability = entity.ability_at(index)
+            if ability.target_type == TargetType.SINGLE:
+                candidates.extend(Action(index, i) for i, target in enumerate(opponents) if target.is_alive)
+            else:
+                candidates.append(Action(index))
+        return candidates or [Action()]
+
+    def rollout(self, battle: 'Battle', caster_index: int, action: Action,
+                horizon: Optional[int] = None,
+                deadline: Optional[float] = None) -> Tuple[Optional[tuple], Optional[float]]:
+        """
+        Play the action on a fork of the battle, then continue with the scripted AI.
+        Returns the transposition key of the state right after the action (None when
+        its targets were drawn at random) and the value of the final state for the caster,
+        or None as value when the perf_counter() deadline passes before the horizon.
+        """
+        fork = battle.fork(rng=self.rng)
+        caster = (fork.players + fork.enemies)[caster_index]
+        ability, targets, slot = fork.decode_action(caster, action)
+        fork.execute_ability(caster, ability, targets, slot)
+        key = self.state_key(fork) if ability.target_type != TargetType.RANDOM else None
+        fork.advance_turn()
+
+        if horizon is None:
+            horizon = self.horizon
+        if horizon is None:
+            horizon = len(fork.living[EntityType.PLAYER]) + len(fork.living[EntityType.ENEMY])
+        for _ in range(horizon):
+            if fork.is_battle_over():
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                return key, None
+            fork.next_turn()
+        return key, self.evaluate(fork, caster.entity_type)
+
+    @staticmethod
+    def state_key(battle: 'Battle') -> tuple:
+        """Hashable summary of everything that influences how the battle continues"""
+        return (battle.round_number, battle.current_turn_index, tuple([
+            (entity.current_hp, tuple(entity.cooldowns),
+             tuple([(effect.name, effect.duration) for effect in entity.status_effects]))
+            for entity in battle.players + battle.enemies
+        ]))
+
+    @staticmethod
+    def evaluate(battle: 'Battle', side: EntityType) -> float:
+        """Value of a battle state for side: HP share difference, or +-WIN_VALUE once decided"""
+        if battle.is_battle_over():
+            return WIN_VALUE if battle.get_winner() == side else -WIN_VALUE
+        own = battle.players if side == EntityType.PLAYER else battle.enemies
+        other = battle.enemies if side == EntityType.PLAYER else battle.players
+        return (sum(e.current_hp for e in own) / sum(e.max_hp for e in own)
+                - sum(e.current_hp for e in other) / sum(e.max_hp for e in other))
+
+    def _record(self, key: tuple, value: float) -> None:
+        stats = self.transpositions.get(key)
+        if stats is None:
+            stats = self.transpositions[key] = [0, 0.0]
+            if len(self.transpositions) > self.cache_size:
+                self.transpositions.popitem(last=False)
+        else:
+            self.transpositions.move_to_end(key)
+        stats[0] += 1
+        stats[1] += value
+
+    def _stats(self, i: int, visits: List[int], totals: List[float], keys: List[Optional[tuple]]) -> Tuple[int, float]:
+        if keys[i] is not None and keys[i] in self.transpositions:
+            return tuple(self.transpositions[keys[i]])
+        return visits[i], totals[i]
+
+    def _mean(self, i: int, visits: List[int], totals: List[float], keys: List[Optional[tuple]]) -> float:
+        count, total = self._stats(i, visits, totals, keys)
+        return total / count if count else -math.inf
+
+    def _pick(self, visits: List[int], totals: List[float], keys: List[Optional[tuple]], rollouts: int,
+              order: List[int]) -> int:
+        """UCB1: try every candidate once, in order, then balance high averages against few visits"""
+        for i in order:
+            if visits[i] == 0:
+                return i
+        log_total = math.log(rollouts)
+
+        def score(i: int) -> float:
+            count, total = self._stats(i, visits, totals, keys)
+            return total / count + self.exploration * math.sqrt(log_total / count)
+
+        return max(range(len(visits)), key=score)
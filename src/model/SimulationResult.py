@@ -0,0 +1,68 @@
+from src.model.Battle import Battle
+from src.model.BattleRecord import BattleRecord
+
+
+class SimulationResult:
+    def __init__(self):
+        self.battles = 0
+        self.player_wins = 0
+        self.enemy_wins = 0
+        self.total_rounds = 0
+        self.total_turns = 0
+        self.player_damage = 0
+        self.enemy_damage = 0
+        self.player_healing = 0
+        self.enemy_healing = 0
+    
+    def record(self, battle: Battle) -> None:
+        """Add the outcome of a finished battle to the totals"""
+        self.add_record(BattleRecord.from_battle(battle))
+    
+    def add_record(self, record: BattleRecord) -> None:
+        """Add a compact battle record to the totals"""
+        self.battles += 1
+        if record.player_won:
+            self.player_wins += 1
+        else:
+            self.enemy_wins += 1
+        
+        self.total_rounds += record.rounds
+        self.total_turns += record.turns
+        self.player_damage += record.player_damage
+        self.enemy_damage += record.enemy_damage
+        self.player_healing += record.player_healing
+        self.enemy_healing += record.enemy_healing
+    
+    def merge(self, other: 'SimulationResult') -> None:
+        """Add the totals of another result to this one"""
+        for attr in vars(self):
+            setattr(self, attr, getattr(self, attr) + getattr(other, attr))
+    
+    @property
+    def win_rate(self) -> float:
+        """Fraction of battles won by the players"""
+        return self.player_wins / self.battles if self.battles else 0.0
+    
+    @property
+    def average_rounds(self) -> float:
+        return self.total_rounds / self.battles if self.battles else 0.0
+    
+    @property
+    def average_turns(self) -> float:
+        return self.total_turns / self.battles if self.battles else 0.0
+    
+    @property
+    def average_player_damage(self) -> float:
+        return self.player_damage / self.battles if self.battles else 0.0
+    
+    @property
+    def average_enemy_damage(self) -> float:
+        return self.enemy_damage / self.battles if self.battles else 0.0
+    
+    def __str__(self) -> str:
+        return (
+            f"Battles: {self.battles}\n"
+            f"Player win rate: {self.win_rate:.2%}\n"
+            f"Average rounds: {self.average_rounds:.2f} | Average turns: {self.average_turns:.2f}\n"
+            f"Average damage dealt: players {self.average_player_damage:.1f} | enemies {self.average_enemy_damage:.1f}"
+        )
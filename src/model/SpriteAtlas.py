@@ -0,0 +1,100 @@
+import json
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import pygame
+
+# Width of the packed texture; sprites are laid out in rows ("shelves") of this width
+ATLAS_WIDTH = 1024
+PADDING = 1
+
+
+class SpriteAtlas:
+    """
+    All sprites packed into one surface, each one a subsurface of it.
+
+    Sprites are looked up by name once, e.g. when a wave spawns, and drawn by their
+    integer id afterwards. Names that share a surface (aliases such as "Wolf 1")
+    share its region. convert() moves the texture to the display's pixel format so
+    blits from it need no conversion.
+    """
+
+    def __init__(self, surface: pygame.Surface, rects: Mapping[str, Tuple[int, int, int, int]]):
+        self.surface = surface
+        self.rects: Dict[str, Tuple[int, int, int, int]] = {name: tuple(rect) for name, rect in rects.items()}
+        self.names: List[str] = list(self.rects)
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self._slice()
+
+    def _slice(self) -> None:
+        regions: Dict[Tuple[int, int, int, int], pygame.Surface] = {}
+        self.sprites: Dict[str, pygame.Surface] = {}
+        for name, rect in self.rects.items():
+            if rect not in regions:
+                regions[rect] = self.surface.subsurface(rect)
+            self.sprites[name] = regions[rect]
+        self.by_id: List[pygame.Surface] = [self.sprites[name] for name in self.names]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __getitem__(self, name: str) -> pygame.Surface:
+        return self.sprites[name]
+
+    @classmethod
+    def pack(cls, images: Mapping[str, pygame.Surface], width: int = ATLAS_WIDTH) -> 'SpriteAtlas':
+        """Shelf-pack the images, tallest first; a surface listed under several names is packed once"""
+        unique: Dict[int, pygame.Surface] = {}
+        for image in images.values():
+            unique.setdefault(id(image), image)
+        alpha = any(image.get_flags() & pygame.SRCALPHA for image in unique.values())
+
+        placed: Dict[int, Tuple[int, int, int, int]] = {}
+        x = y = shelf_height = 0
+        for key, image in sorted(unique.items(), key=lambda item: (-item[1].get_height(), -item[1].get_width())):
+            w, h = image.get_size()
+            if w > width:
+                raise ValueError(f"Sprite of width {w} does not fit in an atlas of width {width}")
+            if x + w > width:
+                y += shelf_height + PADDING
+                x = shelf_height = 0
+            placed[key] = (x, y, w, h)
+            x += w + PADDING
+            shelf_height = max(shelf_height, h)
+
+        surface = pygame.Surface((width, max(1, y + shelf_height)), pygame.SRCALPHA if alpha else 0)
+        surface.blits([(unique[key], rect[:2]) for key, rect in placed.items()], doreturn=False)
+        return cls(surface, {name: placed[id(image)] for name, image in images.items()})
+
+    def convert(self) -> 'SpriteAtlas':
+        """Convert the texture to the display format, keeping per-pixel alpha if it has any"""
+        if self.surface.get_flags() & pygame.SRCALPHA:
+            self.surface = self.surface.convert_alpha()
+        else:
+            self.surface = self.surface.convert()
+        self._slice()
+        return self
+
+    def resolve(self, name: str, default: Optional[str] = None) -> int:
+        """Id of the sprite for name: an exact match, else its first word, else default"""
+        sprite_id = self.ids.get(name)
+        if sprite_id is None:
+            sprite_id = self.ids.get(name.split()[0] if name else name)
+        if sprite_id is None and default is not None:
+            sprite_id = self.ids[default]
+        if sprite_id is None:
+            raise KeyError(name)
+        return sprite_id
+
+    def save(self, image_path: str, index_path: str, **metadata) -> None:
+        """Write the texture as an image and the sprite rects, plus metadata, as JSON"""
+        pygame.image.save(self.surface, image_path)
+        with open(index_path, "w") as f:
+            json.dump(dict(metadata, rects=self.rects), f)
+
+    @classmethod
+    def load(cls, image_path: str, index_path: str) -> Tuple['SpriteAtlas', dict]:
+        """Read an atlas written by save(); returns it and its metadata"""
+        with open(index_path) as f:
+            index = json.load(f)
+        rects = index.pop("rects")
+        return cls(pygame.image.load(image_path), rects), index
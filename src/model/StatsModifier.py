@@ -0,0 +1,55 @@
+from typing import Dict, Iterator, Tuple
+
+
+class StatsModifier:
+    """
+    Fixed-layout record of the relative stat changes of a status effect
+    (0.5 means +50%). Treated as immutable so effects can share it.
+    """
+    __slots__ = ("attack", "defense", "magic_attack", "magic_defense", "speed")
+    
+    def __init__(self, attack: float = 0.0, defense: float = 0.0,
+                 magic_attack: float = 0.0, magic_defense: float = 0.0,
+                 speed: float = 0.0):
+        self.attack = attack
+        self.defense = defense
+        self.magic_attack = magic_attack
+        self.magic_defense = magic_defense
+        self.speed = speed
+    
+    @classmethod
+    def from_dict(cls, modifiers: Dict[str, float]) -> 'StatsModifier':
+        unknown = set(modifiers) - set(cls.__slots__)
+        if unknown:
+            raise ValueError(f"Unknown stats in modifier: {', '.join(sorted(unknown))}")
+        return cls(**modifiers)
+    
+    def get(self, stat: str, default: float = 0.0) -> float:
+        """Dict-style lookup, kept for code written against the old dict modifiers"""
+        return getattr(self, stat, default)
+    
+    def items(self) -> Iterator[Tuple[str, float]]:
+        """Non-zero modifiers as (stat, value) pairs"""
+        for stat in self.__slots__:
+            value = getattr(self, stat)
+            if value:
+                yield stat, value
+    
+    def __bool__(self) -> bool:
+        return any(getattr(self, stat) for stat in self.__slots__)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, StatsModifier):
+            return NotImplemented
+        return all(getattr(self, stat) == getattr(other, stat) for stat in self.__slots__)
+    
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, stat) for stat in self.__slots__))
+    
+    def __repr__(self) -> str:
+        values = ", ".join(f"{stat}={value}" for stat, value in self.items())
+        return f"StatsModifier({values})"
+
+
+# Shared modifier of effects that do not change any stat
+NO_MODIFIER = StatsModifier()
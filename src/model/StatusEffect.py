@@ -1,16 +1,22 @@
-from typing import Dict
-from src.model import DamageType, Entity
+from typing import Dict, Union
+from src.model.BattleEvent import DamageEvent, HealEvent
+from src.model.DamageType import DamageType
+from src.model.StatsModifier import NO_MODIFIER, StatsModifier
 
 
 class StatusEffect:
+    __slots__ = ("name", "duration", "stats_modifier", "dot_damage", "dot_type", "heal_per_turn", "can_act")
+    
     def __init__(self, name: str, duration: int, 
-                 stats_modifier: Dict[str, float] = None,
+                 stats_modifier: Union[StatsModifier, Dict[str, float]] = None,
                  dot_damage: int = 0, dot_type: DamageType = None,
                  heal_per_turn: int = 0,
                  can_act: bool = True):
         self.name = name
         self.duration = duration
-        self.stats_modifier = stats_modifier or {}
+        if isinstance(stats_modifier, dict):
+            stats_modifier = StatsModifier.from_dict(stats_modifier)
+        self.stats_modifier = stats_modifier or NO_MODIFIER
         self.dot_damage = dot_damage  # Damage over time
         self.dot_type = dot_type
         self.heal_per_turn = heal_per_turn
@@ -19,21 +25,35 @@ class StatusEffect:
     def __str__(self):
         return f"{self.name} ({self.duration} turns left)"
 
-    def apply_turn_effects(self, entity: Entity, battle):
-        """Apply effects that happen at the start of an entity's turn"""
-        messages = []
+    def copy(self) -> 'StatusEffect':
+        """Create a fresh instance of this effect, sharing its stats modifier"""
+        effect = StatusEffect.__new__(StatusEffect)
+        effect.name = self.name
+        effect.duration = self.duration
+        effect.stats_modifier = self.stats_modifier
+        effect.dot_damage = self.dot_damage
+        effect.dot_type = self.dot_type
+        effect.heal_per_turn = self.heal_per_turn
+        effect.can_act = self.can_act
+        return effect
+
+    def apply_turn_effects(self, entity: 'Entity', battle):
+        """
+        Apply effects that happen at the start of an entity's turn
+        Returns a list of battle events
+        """
+        events = []
         
         # Apply DOT damage
         if self.dot_damage > 0 and self.dot_type:
             damage = self.dot_damage
             entity.take_damage(damage, self.dot_type)
-            messages.append(f"{entity.name} takes {damage} {self.dot_type.value} damage from {self.name}")
+            events.append(DamageEvent(entity, damage, self.dot_type, self.name))
         
         # Apply healing
         if self.heal_per_turn > 0:
             entity.heal(self.heal_per_turn)
-            messages.append(f"{entity.name} heals for {self.heal_per_turn} from {self.name}")
+            events.append(HealEvent(entity, self.heal_per_turn, self.name))
         
         self.duration -= 1
-        return messages
-
+        return events
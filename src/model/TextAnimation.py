@@ -1,26 +1,47 @@
+from typing import List, Optional
+
 import pygame
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.conf.display import SCREEN
 from src.conf.fonts import Fonts
+from src.model.TextCache import TEXT_CACHE
 
 
 class TextAnimation:
-    def __init__(self, text, position, color, duration=1000, move_distance=50):
+    def __init__(self, text, position, color, duration=1000, move_distance=50,
+                 start_time: Optional[int] = None):
         self.font = Fonts.FONT_MD
+        self.text = None
+        self.color = None
+        self.surface = None
+        self.reset(text, position, color, duration, move_distance, start_time)
+
+    def reset(self, text, position, color, duration=1000, move_distance=50,
+              start_time: Optional[int] = None):
+        """(Re)start the animation, so pooled instances can be reused"""
+        if text != self.text or color != self.color:
+            # Rendered once; fading only changes the surface alpha. A copy, since the
+            # cached surface is shared and its alpha is set here
+            self.surface = TEXT_CACHE.render(self.font, text, color).copy()
         self.text = text
         self.position = position
         self.color = color
         self.duration = duration
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = pygame.time.get_ticks() if start_time is None else start_time
         self.completed = False
         self.move_distance = move_distance
-    
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        elapsed = current_time - self.start_time
+
+    @property
+    def bounds(self) -> pygame.Rect:
+        """Area covered while the text floats up"""
+        width, height = self.surface.get_size()
+        x, y = int(self.position[0]), int(self.position[1])
+        return pygame.Rect(x, y - self.move_distance - 1, width, height + self.move_distance + 2)
+
+    def update(self, now: Optional[int] = None):
+        """Position and alpha at time now (the current time by default)"""
+        if now is None:
+            now = pygame.time.get_ticks()
+        elapsed = now - self.start_time
 
         if elapsed >= self.duration:
             self.completed = True
@@ -33,23 +54,24 @@ class TextAnimation:
 
         return (self.position[0], self.position[1] - y_offset), alpha
 
-    
-    def draw(self, screen):
+    def draw(self, screen, now: Optional[int] = None):
         if self.completed:
             raise Exception("Animation is completed, cannot draw.")
+        TextAnimation.draw_all(screen, [self], now)
 
-        pos, alpha = self.update()
-
-        # Ensure pos is a tuple of integers
-        pos = (int(pos[0]), int(pos[1]))
-
-        # Create text surface with alpha
-        text_surf = self.font.render(self.text, True, self.color)
-        alpha_surf = pygame.Surface(text_surf.get_size(), pygame.SRCALPHA)
-        alpha_surf.fill((255, 255, 255, alpha))
-        text_surf.blit(alpha_surf, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-
-        screen.blit(text_surf, pos)
-        pygame.display.flip()
-
-
+    @staticmethod
+    def draw_all(screen, animations: List['TextAnimation'], now: Optional[int] = None) -> None:
+        """
+        Advance the animations to time now and composite the visible ones in a single
+        batched blit. The frame is presented once by the game loop, not here.
+        """
+        if now is None:
+            now = pygame.time.get_ticks()
+        blits = []
+        for animation in animations:
+            pos, alpha = animation.update(now)
+            if alpha > 0:
+                animation.surface.set_alpha(alpha)
+                blits.append((animation.surface, (int(pos[0]), int(pos[1]))))
+        if blits:
+            screen.blits(blits, doreturn=False)
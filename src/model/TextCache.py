@@ -0,0 +1,53 @@
+from collections import OrderedDict
+from typing import Tuple
+
+import pygame
+
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font, text, color), least recently used evicted first.
+
+    Font rasterization is the most expensive part of drawing a frame, and nearly all UI
+    text (names, HP, log lines, labels) is unchanged from one frame to the next. Cached
+    surfaces are shared: blit them, but copy before modifying one.
+    """
+
+    def __init__(self, capacity: int = 512):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.surfaces: "OrderedDict[Tuple[pygame.font.Font, str, tuple], pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
+
+    def render(self, font: pygame.font.Font, text: str, color) -> pygame.Surface:
+        """Antialiased rendering of text, reused while it stays in the cache"""
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+
+
+# Shared by every screen and widget, so a label drawn in several places is rendered once
+TEXT_CACHE = TextCache()
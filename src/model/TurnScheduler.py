@@ -0,0 +1,181 @@
+import heapq
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+
+class TurnScheduler:
+    """
+    Keeps the living entities of a battle ordered by speed.
+
+    In "rounds" mode the entities are held in a list sorted by (-speed, roster position),
+    which reproduces the stable speed sort of a full re-sort. Deaths and speed changes
+    update it in place, so starting a round is a copy instead of a scan and a sort.
+
+    In "atb" (initiative timeline) mode every entity acts again 100 / speed time units
+    after its previous action. The next actor is popped from a heap, and the timeline
+    moves to it and reschedules it before its turn runs, so deaths and speed changes
+    during the turn (which invalidate or rescale heap entries) see the current time.
+    """
+
+    ROUNDS = "rounds"
+    ATB = "atb"
+    INITIATIVE_THRESHOLD = 100.0
+
+    def __init__(self, entities: List['Entity'], mode: str = ROUNDS):
+        if mode not in (self.ROUNDS, self.ATB):
+            raise ValueError(f"Unknown scheduler mode: {mode}")
+        self.mode = mode
+
+        # Roster position breaks speed ties, like the stable sort over players + enemies
+        self._positions: Dict[int, int] = {id(entity): i for i, entity in enumerate(entities)}
+        self._keys: Dict[int, Tuple[int, int]] = {}
+        self._sorted_keys: List[Tuple[int, int]] = []
+        self._sorted: List['Entity'] = []
+
+        # Initiative timeline
+        self.time = 0.0
+        self._heap: List[Tuple[float, int, int, 'Entity']] = []
+        self._ready_at: Dict[int, float] = {}
+        self._versions: Dict[int, int] = {}
+        self._actor: Optional['Entity'] = None
+
+        for entity in entities:
+            if entity.is_alive:
+                self.add(entity)
+
+        # A round lasts as long as the average living entity needs to act once
+        speeds = [entity.speed for entity in self._sorted if entity.speed > 0]
+        average_speed = sum(speeds) / len(speeds) if speeds else 1
+        self.round_length = self.INITIATIVE_THRESHOLD / average_speed
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def __contains__(self, entity: 'Entity') -> bool:
+        return id(entity) in self._keys
+
+    def _interval(self, entity: 'Entity') -> float:
+        return self.INITIATIVE_THRESHOLD / entity.speed if entity.speed > 0 else float("inf")
+
+    def _push(self, entity: 'Entity', ready_at: float) -> None:
+        key = id(entity)
+        version = self._versions.get(key, 0) + 1
+        self._versions[key] = version
+        self._ready_at[key] = ready_at
+        heapq.heappush(self._heap, (ready_at, self._keys[key][1], version, entity))
+
+    def add(self, entity: 'Entity') -> None:
+        """Add a living entity, e.g. at the start of the battle or when revived"""
+        key = id(entity)
+        if key in self._keys:
+            return
+        position = self._positions.setdefault(key, len(self._positions))
+        sort_key = (-entity.speed, position)
+        self._keys[key] = sort_key
+        index = bisect_left(self._sorted_keys, sort_key)
+        self._sorted_keys.insert(index, sort_key)
+        self._sorted.insert(index, entity)
+        if self.mode == self.ATB:
+            self._push(entity, self.time + self._interval(entity))
+
+    def remove(self, entity: 'Entity') -> None:
+        """Remove an entity that died"""
+        key = id(entity)
+        sort_key = self._keys.pop(key, None)
+        if sort_key is None:
+            return
+        index = bisect_left(self._sorted_keys, sort_key)
+        del self._sorted_keys[index]
+        del self._sorted[index]
+        # The heap entry becomes stale and is skipped when popped
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._ready_at.pop(key, None)
+
+    def update(self, entity: 'Entity') -> None:
+        """Reposition an entity whose speed changed"""
+        key = id(entity)
+        sort_key = self._keys.get(key)
+        if sort_key is None or sort_key[0] == -entity.speed:
+            return
+        old_speed = -sort_key[0]
+        index = bisect_left(self._sorted_keys, sort_key)
+        del self._sorted_keys[index]
+        del self._sorted[index]
+        sort_key = (-entity.speed, sort_key[1])
+        self._keys[key] = sort_key
+        index = bisect_left(self._sorted_keys, sort_key)
+        self._sorted_keys.insert(index, sort_key)
+        self._sorted.insert(index, entity)
+
+        if self.mode == self.ATB:
+            # Keep the filled part of the gauge, fill the rest at the new speed
+            remaining = self._ready_at[key] - self.time
+            if old_speed > 0 and remaining != float("inf"):
+                remaining = remaining * old_speed / entity.speed if entity.speed > 0 else float("inf")
+            else:
+                remaining = self._interval(entity)
+            self._push(entity, self.time + remaining)
+
+    def snapshot(self) -> tuple:
+        """Scheduling state, restored with restore()"""
+        return (dict(self._positions), dict(self._keys), list(self._sorted_keys), list(self._sorted),
+                self.time, list(self._heap), dict(self._ready_at), dict(self._versions), self.round_length,
+                self._actor)
+
+    def restore(self, state: tuple) -> None:
+        (positions, keys, sorted_keys, ordered, self.time, heap, ready_at, versions, self.round_length,
+         self._actor) = state
+        self._positions = dict(positions)
+        self._keys = dict(keys)
+        self._sorted_keys = list(sorted_keys)
+        self._sorted = list(ordered)
+        self._heap = list(heap)
+        self._ready_at = dict(ready_at)
+        self._versions = dict(versions)
+
+    def clone(self, clones: Dict[int, 'Entity']) -> 'TurnScheduler':
+        """Copy of the scheduler for a forked battle, clones maps id(entity) to its clone"""
+        def remap(table: dict) -> dict:
+            return {id(clones[key]): value for key, value in table.items() if key in clones}
+
+        scheduler = TurnScheduler.__new__(TurnScheduler)
+        scheduler.mode = self.mode
+        scheduler._positions = remap(self._positions)
+        scheduler._keys = remap(self._keys)
+        scheduler._sorted_keys = list(self._sorted_keys)
+        scheduler._sorted = [clones[id(entity)] for entity in self._sorted]
+        scheduler.time = self.time
+        scheduler._heap = [(ready_at, position, version, clones[id(entity)])
+                           for ready_at, position, version, entity in self._heap]
+        scheduler._ready_at = remap(self._ready_at)
+        scheduler._versions = remap(self._versions)
+        scheduler.round_length = self.round_length
+        scheduler._actor = clones[id(self._actor)] if self._actor is not None else None
+        return scheduler
+
+    def round_order(self) -> List['Entity']:
+        """Living entities, fastest first, for the next round"""
+        return list(self._sorted)
+
+    def _discard_stale(self) -> None:
+        heap = self._heap
+        while heap and heap[0][2] != self._versions.get(id(heap[0][3])):
+            heapq.heappop(heap)
+
+    def current_actor(self) -> Optional['Entity']:
+        """
+        Entity whose turn it is on the initiative timeline. When no turn is under way,
+        the next entity is popped, the timeline moves to it and it is rescheduled.
+        """
+        if self._actor is None:
+            self._discard_stale()
+            if self._heap:
+                ready_at, _, _, entity = heapq.heappop(self._heap)
+                self.time = ready_at
+                self._push(entity, ready_at + self._interval(entity))
+                self._actor = entity
+        return self._actor
+
+    def advance(self) -> None:
+        """End the current actor's turn; the next call to current_actor() picks the next one"""
+        self._actor = None
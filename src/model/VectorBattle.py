@@ -0,0 +1,399 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.model.AbilityDefinition import AbilityDefinition
+from src.model.DamageType import DamageType
+from src.model.Enemy import Enemy
+from src.model.EntityType import EntityType
+from src.model.Player import Player
+from src.model.StatusEffect import StatusEffect
+from src.model.TargetType import TargetType
+
+# Column order of the stat arrays
+STATS = ("attack", "defense", "magic_attack", "magic_defense", "speed")
+ATK, DEF, MATK, MDEF, SPD = range(len(STATS))
+
+# Integer codes used in the ability and effect tables
+PHYSICAL, MAGICAL, TRUE = 0, 1, 2
+TARGET_CODES = {target_type: code for code, target_type in enumerate(TargetType)}
+SINGLE = TARGET_CODES[TargetType.SINGLE]
+ALL = TARGET_CODES[TargetType.ALL]
+SELF = TARGET_CODES[TargetType.SELF]
+ALLIES = TARGET_CODES[TargetType.ALLIES]
+RANDOM = TARGET_CODES[TargetType.RANDOM]
+LOWEST_HP_ALLY = TARGET_CODES[TargetType.LOWEST_HP_ALLY]
+LOWEST_HP_ENEMY = TARGET_CODES[TargetType.LOWEST_HP_ENEMY]
+AOE_TARGETS = (ALL, ALLIES, RANDOM)
+PLAYER_HEAL_TARGETS = (SINGLE, ALLIES, ALL)
+
+# Basic attack used when no ability is ready: attack // 2 + bonus
+PLAYER_BASIC_BONUS = 10
+ENEMY_BASIC_BONUS = 5
+HEALING_THRESHOLD = 0.5
+
+
+def damage_code(damage_type: Optional[DamageType]) -> int:
+    if damage_type == DamageType.PHYSICAL:
+        return PHYSICAL
+    if damage_type == DamageType.MAGICAL:
+        return MAGICAL
+    return TRUE
+
+
+class VectorBattle:
+    """
+    Structure-of-arrays battle engine that advances K independent battles at once.
+
+    Every battle has the same number of entity slots: players first, then enemies,
+    padded with dead slots when waves differ in size. Stats, HP, cooldowns and
+    status-effect durations live in NumPy arrays indexed by (battle, slot), and each
+    turn position of a round is resolved for all K battles with vectorized versions of
+    Battle.execute_ability and Entity.take_damage.
+    """
+
+    def __init__(self, rosters: List[Tuple[List[Player], List[Enemy]]],
+                 seed: Optional[int] = None, max_rounds: int = 200):
+        self.np_rng = np.random.default_rng(seed)
+        self.max_rounds = max_rounds
+        self.k = len(rosters)
+        self._build_tables(rosters)
+
+        k = self.k
+        self.round_number = np.zeros(k, dtype=np.int64)
+        self.turns_taken = np.zeros(k, dtype=np.int64)
+        self.damage_dealt = np.zeros((k, 2), dtype=np.int64)
+        self.healing_done = np.zeros((k, 2), dtype=np.int64)
+        self.done = ~self._sides_alive()
+
+    def _build_tables(self, rosters: List[Tuple[List[Player], List[Enemy]]]) -> None:
+        """Pack entity rosters into arrays and compile the ability and effect tables"""
+        abilities: List[AbilityDefinition] = []
+        ability_index: Dict[tuple, int] = {}
+        effects: List[StatusEffect] = []
+        effect_index: Dict[str, int] = {}
+
+        def ability_id(ability: AbilityDefinition) -> int:
+            key = (ability.name, ability.max_cooldown, ability.damage, ability.damage_type,
+                   ability.healing, ability.target_type, ability.aoe_damage_reduction,
+                   ability.status_effect.name if ability.status_effect else None)
+            if key not in ability_index:
+                ability_index[key] = len(abilities)
+                abilities.append(ability)
+                effect = ability.status_effect
+                if effect and effect.name not in effect_index:
+                    effect_index[effect.name] = len(effects)
+                    effects.append(effect)
+            return ability_index[key]
+
+        num_players = max(len(players) for players, _ in rosters)
+        num_enemies = max(len(enemies) for _, enemies in rosters)
+        max_abilities = max(len(entity.abilities) for players, enemies in rosters
+                            for entity in players + enemies)
+        k = self.k
+        e = num_players + num_enemies
+        a = max(max_abilities, 1)
+
+        self.num_players = num_players
+        self.num_entities = e
+        self.is_enemy = np.arange(e) >= num_players
+        self.max_hp = np.ones((k, e), dtype=np.int64)
+        self.hp = np.zeros((k, e), dtype=np.int64)
+        self.alive = np.zeros((k, e), dtype=bool)
+        self.base_stats = np.zeros((k, e, len(STATS)), dtype=np.int64)
+        self.aggression = np.zeros((k, e), dtype=np.float64)
+        self.ability_ids = np.full((k, e, a), -1, dtype=np.int64)
+        # Remaining cooldown of every ability slot of every entity, like Entity.cooldowns
+        self.cooldowns = np.zeros((k, e, a), dtype=np.int64)
+
+        for b, (players, enemies) in enumerate(rosters):
+            slots = list(enumerate(players)) + [(num_players + i, enemy) for i, enemy in enumerate(enemies)]
+            for slot, entity in slots:
+                self.max_hp[b, slot] = entity.max_hp
+                self.hp[b, slot] = entity.current_hp
+                self.alive[b, slot] = entity.is_alive
+                self.base_stats[b, slot] = [entity.base_attack, entity.base_defense,
+                                            entity.base_magic_attack, entity.base_magic_defense,
+                                            entity.base_speed]
+                self.aggression[b, slot] = getattr(entity, "aggression", 0.0)
+                for i, ability in enumerate(entity.abilities):
+                    self.ability_ids[b, slot, i] = ability_id(ability)
+                self.cooldowns[b, slot, :len(entity.cooldowns)] = entity.cooldowns
+
+        # Ability table, indexed by ability id
+        self.ab_cooldown = np.array([ab.max_cooldown for ab in abilities], dtype=np.int64)
+        self.ab_damage = np.array([ab.damage for ab in abilities], dtype=np.int64)
+        self.ab_damage_type = np.array([damage_code(ab.damage_type) for ab in abilities], dtype=np.int64)
+        self.ab_healing = np.array([ab.healing for ab in abilities], dtype=np.int64)
+        self.ab_target = np.array([TARGET_CODES[ab.target_type] for ab in abilities], dtype=np.int64)
+        self.ab_aoe = np.array([ab.aoe_damage_reduction for ab in abilities], dtype=np.float64)
+        self.ab_effect = np.array([effect_index[ab.status_effect.name] if ab.status_effect else -1
+                                   for ab in abilities], dtype=np.int64)
+
+        # Effect table, indexed by effect id
+        f = max(len(effects), 1)
+        self.fx_duration = np.zeros(f, dtype=np.int64)
+        self.fx_modifiers = np.zeros((f, len(STATS)), dtype=np.float64)
+        self.fx_dot = np.zeros(f, dtype=np.int64)
+        self.fx_dot_type = np.full(f, TRUE, dtype=np.int64)
+        self.fx_heal = np.zeros(f, dtype=np.int64)
+        self.fx_stuns = np.zeros(f, dtype=bool)
+        for i, effect in enumerate(effects):
+            self.fx_duration[i] = effect.duration
+            self.fx_modifiers[i] = [getattr(effect.stats_modifier, stat) for stat in STATS]
+            self.fx_dot[i] = effect.dot_damage if effect.dot_type else 0
+            self.fx_dot_type[i] = damage_code(effect.dot_type)
+            self.fx_heal[i] = effect.heal_per_turn
+            self.fx_stuns[i] = not effect.can_act
+
+        # Remaining duration of every effect on every entity, 0 when inactive
+        self.effect_durations = np.zeros((k, e, f), dtype=np.int64)
+        for b, (players, enemies) in enumerate(rosters):
+            for slot, entity in enumerate(players + enemies):
+                slot = slot if slot < len(players) else num_players + slot - len(players)
+                for effect in entity.status_effects:
+                    if effect.name in effect_index:
+                        self.effect_durations[b, slot, effect_index[effect.name]] = effect.duration
+
+    def effective_stats(self, rows: np.ndarray, slots: np.ndarray) -> np.ndarray:
+        """Stats of the given (battle, slot) pairs after status-effect modifiers"""
+        active = self.effect_durations[rows, slots] > 0
+        multiplier = 1.0 + active @ self.fx_modifiers
+        return np.maximum((self.base_stats[rows, slots] * multiplier).astype(np.int64), 0)
+
+    def all_effective_stats(self) -> np.ndarray:
+        """Stats of every entity of every battle after status-effect modifiers"""
+        multiplier = 1.0 + (self.effect_durations > 0) @ self.fx_modifiers
+        return np.maximum((self.base_stats * multiplier).astype(np.int64), 0)
+
+    def _sides_alive(self) -> np.ndarray:
+        players_alive = self.alive[:, ~self.is_enemy].any(axis=1)
+        enemies_alive = self.alive[:, self.is_enemy].any(axis=1)
+        return players_alive & enemies_alive
+
+    def take_damage(self, rows: np.ndarray, targets: np.ndarray,
+                    damage: np.ndarray, damage_type: np.ndarray) -> np.ndarray:
+        """Vectorized Entity.take_damage, returns the damage actually dealt"""
+        stats = self.effective_stats(rows, targets)
+        defense = np.where(damage_type == PHYSICAL, stats[:, DEF],
+                           np.where(damage_type == MAGICAL, stats[:, MDEF], 0))
+        reduction = np.where(damage_type == TRUE, 0.0, defense / (defense + 100))
+        alive = self.alive[rows, targets]
+        dealt = np.where(alive, np.maximum((damage * (1 - reduction)).astype(np.int64), 1), 0)
+        hp = self.hp[rows, targets] - dealt
+        self.alive[rows, targets] = alive & (hp > 0)
+        self.hp[rows, targets] = np.maximum(hp, 0)
+        return dealt
+
+    def heal(self, rows: np.ndarray, targets: np.ndarray, amount: np.ndarray) -> np.ndarray:
+        """Vectorized Entity.heal, returns the amount actually healed"""
+        before = self.hp[rows, targets]
+        after = np.where(self.alive[rows, targets],
+                         np.minimum(before + amount, self.max_hp[rows, targets]), before)
+        self.hp[rows, targets] = after
+        return after - before
+
+    def run(self) -> None:
+        """Advance every battle until it is over or max_rounds is reached"""
+        while not self.done.all() and self.round_number[~self.done].min() < self.max_rounds:
+            self.process_round()
+
+    def process_round(self) -> None:
+        """Resolve one round of every unfinished battle"""
+        k, e = self.k, self.num_entities
+        started = ~self.done
+
+        # Turn order: living entities by speed, ties keep roster order like sorted()
+        speed = self.all_effective_stats()[:, :, SPD]
+        order_key = np.where(self.alive, speed, -1)
+        turn_order = np.argsort(-order_key, axis=1, kind="stable")
+        round_length = self.alive.sum(axis=1)
+        in_order = np.take_along_axis(self.alive, turn_order, axis=1)
+
+        ended_at = np.full(k, -1, dtype=np.int64)
+        for position in range(e):
+            rows = np.nonzero(~self.done & in_order[:, position])[0]
+            if rows.size:
+                self.process_turn(rows, turn_order[rows, position])
+            newly_done = ~self.done & ~self._sides_alive()
+            ended_at[newly_done] = position
+            self.done |= newly_done
+
+        # A battle counts the round only if it was still running on the last turn of it
+        self.round_number += started & ((ended_at == -1) | (ended_at == round_length - 1))
+
+    def process_turn(self, rows: np.ndarray, actors: np.ndarray) -> None:
+        """Vectorized Battle.process_turn for one actor in each of the given battles"""
+        # Skip entities that died earlier in the round
+        living = self.alive[rows, actors]
+        rows, actors = rows[living], actors[living]
+        if not rows.size:
+            return
+
+        self.update_status_effects(rows, actors)
+
+        can_act = ~(self.effect_durations[rows, actors] > 0)[:, self.fx_stuns].any(axis=1)
+        rows, actors = rows[can_act], actors[can_act]
+        if not rows.size:
+            return
+
+        self.turns_taken[rows] += 1
+
+        # Reduce cooldowns of the actor's abilities
+        self.cooldowns[rows, actors] = np.maximum(self.cooldowns[rows, actors] - 1, 0)
+
+        slot_choice = self.select_ability(rows, actors)
+        targets = self.select_targets(rows, actors, slot_choice)
+        self.execute_ability(rows, actors, slot_choice, targets)
+
+    def update_status_effects(self, rows: np.ndarray, actors: np.ndarray) -> None:
+        """Apply DOT and healing effects, then tick every active effect down by one"""
+        for effect in range(self.fx_duration.size):
+            active = self.effect_durations[rows, actors, effect] > 0
+            if not active.any():
+                continue
+            effect_rows, effect_actors = rows[active], actors[active]
+            if self.fx_dot[effect] > 0:
+                damage = np.full(effect_rows.size, self.fx_dot[effect])
+                damage_type = np.full(effect_rows.size, self.fx_dot_type[effect])
+                self.take_damage(effect_rows, effect_actors, damage, damage_type)
+            if self.fx_heal[effect] > 0:
+                self.heal(effect_rows, effect_actors, np.full(effect_rows.size, self.fx_heal[effect]))
+            self.effect_durations[effect_rows, effect_actors, effect] -= 1
+
+    def _choose(self, mask: np.ndarray) -> np.ndarray:
+        """Pick one True column uniformly per row of mask, -1 for empty rows"""
+        counts = mask.sum(axis=1)
+        pick = (self.np_rng.random(mask.shape[0]) * counts).astype(np.int64)
+        chosen = (np.cumsum(mask, axis=1) > pick[:, None]) & mask
+        return np.where(counts > 0, chosen.argmax(axis=1), -1)
+
+    def select_ability(self, rows: np.ndarray, actors: np.ndarray) -> np.ndarray:
+        """
+        Vectorized Player/Enemy.select_ability.
+        Returns the chosen ability slot per battle, or -1 for the basic attack.
+        """
+        ids = self.ability_ids[rows, actors]
+        valid = ids >= 0
+        safe_ids = np.where(valid, ids, 0)
+        ready = valid & (self.cooldowns[rows, actors] == 0)
+        damaging = ready & (self.ab_damage[safe_ids] > 0)
+        healing = ready & (self.ab_healing[safe_ids] > 0) & np.isin(self.ab_target[safe_ids], PLAYER_HEAL_TARGETS)
+
+        enemy_actor = self.is_enemy[actors]
+
+        # Players heal when an ally is below the threshold, otherwise prefer damage
+        ally_alive = self.alive[rows] & (self.is_enemy[None, :] == enemy_actor[:, None])
+        low_hp = (ally_alive & (self.hp[rows] / self.max_hp[rows] < HEALING_THRESHOLD)).any(axis=1)
+        player_preferred = np.where(low_hp[:, None], healing, damaging)
+
+        # Enemies prefer damage with probability equal to their aggression
+        aggressive = self.np_rng.random(rows.size) < self.aggression[rows, actors]
+        enemy_preferred = np.where(aggressive[:, None], damaging, ready)
+
+        preferred = np.where(enemy_actor[:, None], enemy_preferred, player_preferred)
+        candidates = np.where(preferred.any(axis=1)[:, None], preferred, ready)
+        return self._choose(candidates)
+
+    def _ability_column(self, rows: np.ndarray, actors: np.ndarray,
+                        slot_choice: np.ndarray, table: np.ndarray, basic) -> np.ndarray:
+        ids = self.ability_ids[rows, actors, np.maximum(slot_choice, 0)]
+        return np.where(slot_choice >= 0, table[np.maximum(ids, 0)], basic)
+
+    def select_targets(self, rows: np.ndarray, actors: np.ndarray, slot_choice: np.ndarray) -> np.ndarray:
+        """Vectorized Battle.select_targets, returns a (battles, entities) target mask"""
+        target_type = self._ability_column(rows, actors, slot_choice, self.ab_target, SINGLE)
+        alive = self.alive[rows]
+        same_side = self.is_enemy[None, :] == self.is_enemy[actors][:, None]
+        enemies = alive & ~same_side
+        allies = alive & same_side
+
+        targets = np.zeros_like(alive)
+
+        single = target_type == SINGLE
+        if single.any():
+            choice = self._choose(enemies[single])
+            chosen = np.zeros_like(enemies[single])
+            has_target = choice >= 0
+            chosen[np.nonzero(has_target)[0], choice[has_target]] = True
+            targets[single] = chosen
+
+        targets[target_type == ALL] = enemies[target_type == ALL]
+        targets[target_type == ALLIES] = allies[target_type == ALLIES]
+
+        is_self = np.nonzero(target_type == SELF)[0]
+        targets[is_self, actors[is_self]] = self.alive[rows[is_self], actors[is_self]]
+
+        random_rows = target_type == RANDOM
+        if random_rows.any():
+            pool = enemies[random_rows]
+            count = np.minimum(self.np_rng.integers(1, 4, size=pool.shape[0]), pool.sum(axis=1))
+            keys = np.where(pool, self.np_rng.random(pool.shape), np.inf)
+            rank = np.argsort(np.argsort(keys, axis=1), axis=1)
+            targets[random_rows] = pool & (rank < count[:, None])
+
+        ratio = self.hp[rows] / self.max_hp[rows]
+        for code, pool in ((LOWEST_HP_ALLY, allies), (LOWEST_HP_ENEMY, enemies)):
+            lowest_rows = np.nonzero((target_type == code) & pool.any(axis=1))[0]
+            if lowest_rows.size:
+                lowest = np.where(pool[lowest_rows], ratio[lowest_rows], np.inf).argmin(axis=1)
+                targets[lowest_rows, lowest] = True
+
+        return targets
+
+    def execute_ability(self, rows: np.ndarray, actors: np.ndarray,
+                        slot_choice: np.ndarray, targets: np.ndarray) -> None:
+        """Vectorized Battle.execute_ability over a (battles, entities) target mask"""
+        has_targets = targets.any(axis=1)
+        rows, actors, slot_choice, targets = rows[has_targets], actors[has_targets], \
+            slot_choice[has_targets], targets[has_targets]
+        if not rows.size:
+            return
+
+        # Put the chosen ability on cooldown
+        used = slot_choice >= 0
+        used_ids = self.ability_ids[rows[used], actors[used], slot_choice[used]]
+        self.cooldowns[rows[used], actors[used], slot_choice[used]] = self.ab_cooldown[used_ids]
+
+        caster_stats = self.effective_stats(rows, actors)
+        side = self.is_enemy[actors].astype(np.int64)
+        basic_damage = caster_stats[:, ATK] // 2 + np.where(side == 1, ENEMY_BASIC_BONUS, PLAYER_BASIC_BONUS)
+        damage = self._ability_column(rows, actors, slot_choice, self.ab_damage, basic_damage)
+        damage_type = self._ability_column(rows, actors, slot_choice, self.ab_damage_type, PHYSICAL)
+        target_type = self._ability_column(rows, actors, slot_choice, self.ab_target, SINGLE)
+        aoe = self._ability_column(rows, actors, slot_choice, self.ab_aoe, 1.0)
+        healing = self._ability_column(rows, actors, slot_choice, self.ab_healing, 0)
+        effect = self._ability_column(rows, actors, slot_choice, self.ab_effect, -1)
+
+        # Damage
+        is_aoe = (targets.sum(axis=1) > 1) & np.isin(target_type, AOE_TARGETS)
+        base_damage = np.where(is_aoe, (damage * aoe).astype(np.int64), damage)
+        actual_damage = base_damage + np.where(damage_type == PHYSICAL, caster_stats[:, ATK] // 3,
+                                               np.where(damage_type == MAGICAL, caster_stats[:, MATK] // 3, 0))
+        hit_rows, hit_targets = np.nonzero(targets & (damage > 0)[:, None])
+        if hit_rows.size:
+            dealt = self.take_damage(rows[hit_rows], hit_targets,
+                                     actual_damage[hit_rows], damage_type[hit_rows])
+            np.add.at(self.damage_dealt, (rows[hit_rows], side[hit_rows]), dealt)
+
+        # Healing, boosted for casters whose magic attack exceeds their attack
+        heal_amount = healing + np.where(caster_stats[:, MATK] > caster_stats[:, ATK], caster_stats[:, MATK] // 5, 0)
+        heal_rows, heal_targets = np.nonzero(targets & (healing > 0)[:, None])
+        if heal_rows.size:
+            healed = self.heal(rows[heal_rows], heal_targets, heal_amount[heal_rows])
+            np.add.at(self.healing_done, (rows[heal_rows], side[heal_rows]), healed)
+
+        # Status effects on targets that survived
+        effect_rows, effect_targets = np.nonzero(targets & (effect >= 0)[:, None])
+        if effect_rows.size:
+            survived = self.alive[rows[effect_rows], effect_targets]
+            effect_rows, effect_targets = effect_rows[survived], effect_targets[survived]
+            effect_ids = effect[effect_rows]
+            self.effect_durations[rows[effect_rows], effect_targets, effect_ids] = self.fx_duration[effect_ids]
+
+    def winners(self) -> np.ndarray:
+        """Boolean array, True where the players won"""
+        return self.alive[:, ~self.is_enemy].any(axis=1) & ~self.alive[:, self.is_enemy].any(axis=1)
+
+    def damage_by_side(self, entity_type: EntityType) -> np.ndarray:
+        return self.damage_dealt[:, int(entity_type == EntityType.ENEMY)]
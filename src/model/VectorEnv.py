@@ -0,0 +1,190 @@
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.abilities.abilities import create_abilities
+from src.model.Battle import Battle
+from src.model.EntityType import EntityType
+from src.model.Observation import ABILITY_SLOTS, FEATURE_SIZE, MAX_OPPONENTS, Action, Observation
+from src.model.Policy import Policy
+from src.services.create_teams import create_enemy_wave, create_player_team
+
+# Reward for winning (or, negated, losing) a battle; every step also earns the change in
+# (player HP share - enemy HP share) so damage dealt and avoided is rewarded along the way
+WIN_REWARD = 1.0
+
+
+class VectorEnv:
+    """
+    Gym-style vectorized environment: num_envs battles of a player team against a wave,
+    stepped together.
+
+    The agent controls the player team. Observations are Observation.features() vectors
+    of the player about to act, stacked into a (num_envs, FEATURE_SIZE) float32 array.
+    Actions are (ability slot, opponent slot) pairs, see Action. Turns of the enemies
+    are played in between by opponent_policy (batched across environments) or by the
+    scripted AI. Battles run headless without delays or logs, and a finished battle is
+    replaced by a new one straight away: the observation returned for it is the first of
+    the new battle, and its info holds the outcome of the finished one.
+
+    Battle i is seeded with seed + i * seed_step; ParallelVectorEnv gives each of its
+    shards a different offset and the shard count as step, so no two shards share a seed.
+    """
+
+    def __init__(self, num_envs: int, team: Sequence[str], wave_number: int, seed: int = 0,
+                 opponent_policy: Optional[Policy] = None, max_turns: int = 500, seed_step: int = 1):
+        self.num_envs = num_envs
+        self.team = tuple(team)
+        self.wave_number = wave_number
+        self.opponent_policy = opponent_policy
+        self.max_turns = max_turns
+        self.next_seed = seed
+        self.seed_step = seed_step
+        # Ability definitions are immutable, every battle can share them
+        self.abilities = create_abilities()
+
+        self.battles: List[Optional[Battle]] = [None] * num_envs
+        self.actors: List[Optional['Entity']] = [None] * num_envs
+        self.scores = np.zeros(num_envs)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+
+    @property
+    def observation_shape(self) -> Tuple[int]:
+        return (FEATURE_SIZE,)
+
+    @property
+    def action_shape(self) -> Tuple[int]:
+        return (2,)
+
+    def new_battle(self) -> Battle:
+        rng = random.Random(self.next_seed)
+        self.next_seed += self.seed_step
+        roster = {player.name: player for player in create_player_team(self.abilities)}
+        players = [roster[name] for name in self.team]
+        enemies = create_enemy_wave(self.abilities, self.wave_number, rng)
+        if self.opponent_policy is not None:
+            for enemy in enemies:
+                enemy.policy = self.opponent_policy
+        battle = Battle(players, enemies, delay=0, rng=rng, record_log=False)
+        battle.begin_battle()
+        return battle
+
+    def reset(self) -> np.ndarray:
+        """Start a new battle in every environment and return the first observations"""
+        for i in range(self.num_envs):
+            self.battles[i] = self.new_battle()
+            self.episode_steps[i] = 0
+        self._advance(range(self.num_envs))
+        for i in range(self.num_envs):
+            while self.actors[i] is None:
+                # The players never got to act; start over with the next seed
+                self.battles[i] = self.new_battle()
+                self._advance([i])
+        return self.observations()
+
+    def step(self, actions: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """
+        Play one action per environment, given as an (num_envs, 2) array or a sequence of
+        Action, and advance every battle to the next player decision.
+        Returns observations, rewards, done flags and infos.
+        """
+        if self.battles[0] is None:
+            raise RuntimeError("Call reset() before step()")
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 2)
+
+        for i, (ability, target) in enumerate(actions):
+            battle, actor = self.battles[i], self.actors[i]
+            battle.finish_turn(actor, *battle.decode_action(actor, Action(int(ability), int(target))))
+            battle.advance_turn()
+            self.actors[i] = None
+            self.episode_steps[i] += 1
+        self._advance(range(self.num_envs))
+
+        rewards = np.zeros(self.num_envs)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos: List[Dict[str, Any]] = [{} for _ in range(self.num_envs)]
+        for i, battle in enumerate(self.battles):
+            score = self._score(battle)
+            rewards[i] = score - self.scores[i]
+            self.scores[i] = score
+            if self.actors[i] is None:
+                # Either decided, or cut off after max_turns
+                truncated = not battle.is_battle_over()
+                won = battle.get_winner() == EntityType.PLAYER
+                if not truncated:
+                    rewards[i] += WIN_REWARD if won else -WIN_REWARD
+                dones[i] = True
+                infos[i] = {"won": won, "truncated": truncated, "rounds": battle.round_number,
+                            "turns": battle.turns_taken, "steps": int(self.episode_steps[i])}
+                self._reset_env(i)
+        return self.observations(), rewards, dones, infos
+
+    def observations(self) -> np.ndarray:
+        return np.array([Observation(battle, actor).features()
+                         for battle, actor in zip(self.battles, self.actors)], dtype=np.float32)
+
+    def action_masks(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Legal ability slots (last column: basic attack) and living opponent slots per environment"""
+        abilities = np.zeros((self.num_envs, ABILITY_SLOTS + 1), dtype=bool)
+        targets = np.zeros((self.num_envs, MAX_OPPONENTS), dtype=bool)
+        abilities[:, ABILITY_SLOTS] = True
+        for i, (battle, actor) in enumerate(zip(self.battles, self.actors)):
+            for slot, remaining in enumerate(actor.cooldowns[:ABILITY_SLOTS]):
+                abilities[i, slot] = remaining == 0
+            for slot, enemy in enumerate(battle.enemies[:MAX_OPPONENTS]):
+                targets[i, slot] = enemy.is_alive
+        return abilities, targets
+
+    def _reset_env(self, i: int) -> None:
+        self.actors[i] = None
+        while self.actors[i] is None:
+            self.battles[i] = self.new_battle()
+            self.episode_steps[i] = 0
+            self._advance([i])
+        self.scores[i] = self._score(self.battles[i])
+
+    @staticmethod
+    def _score(battle: Battle) -> float:
+        players = sum(p.current_hp for p in battle.players) / sum(p.max_hp for p in battle.players)
+        enemies = sum(e.current_hp for e in battle.enemies) / sum(e.max_hp for e in battle.enemies)
+        return players - enemies
+
+    def _advance(self, indices) -> None:
+        """
+        Play turns in the given environments until a player has to act or the battle is
+        over (self.actors[i] stays None). Enemy decisions of all environments waiting on
+        opponent_policy in the same pass are made with one act_batch call.
+        """
+        pending = [i for i in indices if self.actors[i] is None]
+        while pending:
+            policy_turns: List[Tuple[int, 'Entity']] = []
+            still_pending = []
+            for i in pending:
+                battle = self.battles[i]
+                if battle.is_battle_over():
+                    battle.end_battle()
+                    continue
+                if battle.turns_taken >= self.max_turns:
+                    continue
+                entity = battle.begin_turn()
+                if entity is None:
+                    battle.advance_turn()
+                    still_pending.append(i)
+                elif entity.entity_type == EntityType.PLAYER:
+                    self.actors[i] = entity
+                elif entity.policy is not None:
+                    policy_turns.append((i, entity))
+                else:
+                    battle.finish_turn(entity, *entity.select_ability(battle))
+                    battle.advance_turn()
+                    still_pending.append(i)
+
+            if policy_turns:
+                observations = [Observation(self.battles[i], entity) for i, entity in policy_turns]
+                for (i, entity), action in zip(policy_turns, self.opponent_policy.act_batch(observations)):
+                    battle = self.battles[i]
+                    battle.finish_turn(entity, *battle.decode_action(entity, action))
+                    battle.advance_turn()
+                    still_pending.append(i)
+            pending = still_pending
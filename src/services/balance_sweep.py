@@ -0,0 +1,264 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from src.model.SimulationResult import SimulationResult
+from src.services.content_registry import STATS, ContentRegistry, get_registry
+from src.services.outcome_cache import OutcomeCache, wave_signature
+from src.services.simulate_battles import run_wave_battle
+
+Number = Union[int, float]
+
+# Tunable fields besides the class stats; the scale factor of generated waves is
+# wave_number / scale_divisor
+ABILITY_FIELDS = ("cooldown", "damage", "healing", "aoe_damage_reduction")
+WAVE_FIELDS = ("scale_divisor", "base_enemy_count", "aggression_base", "aggression_per_wave", "boss_aggression")
+INTEGER_FIELDS = set(STATS) | {"cooldown", "damage", "healing", "base_enemy_count"}
+
+
+class SweepParameter(NamedTuple):
+    """
+    A tunable number, named class.<Class>.<stat>, ability.<id>.<field> or wave.<field>.
+    values are the grid points; low/high bound random samples when values is empty.
+    """
+    name: str
+    values: Tuple[Number, ...] = ()
+    low: Number = 0
+    high: Number = 0
+
+
+class SweepTask(NamedTuple):
+    """Battles of one parameter point against one wave"""
+    key: str
+    signature: str
+    params: Tuple[Tuple[str, Number], ...]
+    team: Tuple[str, ...]
+    wave_number: int
+    seed_start: int
+    seed_stop: int
+
+
+def _number(text: str) -> Number:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_parameter(text: str) -> SweepParameter:
+    """Parse name=v1,v2,... (grid values) or name=low:high (random search range)"""
+    name, sep, spec = text.partition("=")
+    if not sep or not spec:
+        raise ValueError(f"Expected name=v1,v2,... or name=low:high, got {text!r}")
+    try:
+        if ":" in spec:
+            low, high = (_number(part) for part in spec.split(":"))
+            parameter = SweepParameter(name, low=low, high=high)
+        else:
+            parameter = SweepParameter(name, values=tuple(_number(part) for part in spec.split(",")))
+    except ValueError:
+        raise ValueError(f"Invalid values for {name}: {spec!r}") from None
+    _field_of(name)
+    return parameter
+
+
+def _field_of(name: str) -> str:
+    parts = name.split(".")
+    if parts[0] == "class" and len(parts) == 3 and parts[2] in STATS:
+        return parts[2]
+    if parts[0] == "ability" and len(parts) == 3 and parts[2] in ABILITY_FIELDS:
+        return parts[2]
+    if parts[0] == "wave" and len(parts) == 2 and parts[1] in WAVE_FIELDS:
+        return parts[1]
+    raise ValueError(
+        f"Unknown parameter {name!r}: expected class.<Class>.<{'|'.join(STATS)}>, "
+        f"ability.<id>.<{'|'.join(ABILITY_FIELDS)}> or wave.<{'|'.join(WAVE_FIELDS)}>"
+    )
+
+
+def apply_parameters(registry: ContentRegistry, params: Iterable[Tuple[str, Number]]) -> ContentRegistry:
+    """Copy of the registry with the given parameter values"""
+    classes = {spec.name: spec for spec in registry.classes}
+    abilities = dict(registry.abilities)
+    scaled_waves = registry.scaled_waves
+
+    for name, value in params:
+        field = _field_of(name)
+        if field in INTEGER_FIELDS and value != int(value):
+            raise ValueError(f"{name} must be an integer, got {value}")
+        if field in INTEGER_FIELDS:
+            value = int(value)
+        parts = name.split(".")
+        if parts[0] == "class":
+            if parts[1] not in classes:
+                raise ValueError(f"Unknown class {parts[1]!r}")
+            spec = classes[parts[1]]
+            stats = list(spec.stats)
+            stats[STATS.index(field)] = value
+            classes[parts[1]] = spec._replace(stats=tuple(stats))
+        elif parts[0] == "ability":
+            if parts[1] not in abilities:
+                raise ValueError(f"Unknown ability {parts[1]!r}")
+            abilities[parts[1]] = abilities[parts[1]]._replace(**{field: value})
+        else:
+            scaled_waves = scaled_waves._replace(**{field: value})
+
+    if scaled_waves.scale_divisor <= 0:
+        raise ValueError("wave.scale_divisor must be positive")
+    return registry.replace(classes=tuple(classes.values()), abilities=abilities, scaled_waves=scaled_waves)
+
+
+def grid_points(parameters: Sequence[SweepParameter]) -> Iterator[Tuple[Tuple[str, Number], ...]]:
+    """Every combination of the parameters' grid values"""
+    names = [parameter.name for parameter in parameters]
+    for values in itertools.product(*(parameter.values for parameter in parameters)):
+        yield tuple(zip(names, values))
+
+
+def random_points(parameters: Sequence[SweepParameter], samples: int,
+                  seed: int = 0) -> Iterator[Tuple[Tuple[str, Number], ...]]:
+    """
+    samples points drawn uniformly: from the values of grid parameters, and within
+    [low, high] of range parameters (integers when both bounds are integers).
+    The same seed yields the same points, so an interrupted random sweep resumes too.
+    """
+    rng = random.Random(seed)
+    for _ in range(samples):
+        point = []
+        for parameter in parameters:
+            if parameter.values:
+                value = rng.choice(parameter.values)
+            elif isinstance(parameter.low, int) and isinstance(parameter.high, int):
+                value = rng.randint(parameter.low, parameter.high)
+            else:
+                value = round(rng.uniform(parameter.low, parameter.high), 6)
+            point.append((parameter.name, value))
+        yield tuple(point)
+
+
+def task_key(params: Sequence[Tuple[str, Number]], signature: str) -> str:
+    """
+    Stable identifier of a task: its parameters and the wave_signature() of the content
+    they produce, so editing content a task does not use keeps its stored result valid
+    """
+    payload = json.dumps([sorted(params), signature])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def run_task(task: SweepTask) -> Tuple[SweepTask, SimulationResult]:
+    """Worker entry point: rebuild the registry of the point and run its battles"""
+    registry = apply_parameters(get_registry(), task.params)
+    result = SimulationResult()
+    for seed in range(task.seed_start, task.seed_stop):
+        result.record(run_wave_battle(task.team, task.wave_number, seed, registry))
+    return task, result
+
+
+class SweepStore:
+    """
+    SQLite table of finished tasks, one row per parameter point and wave.
+    Rows are committed as tasks finish, so an interrupted sweep loses at most the
+    tasks that were running and skips everything already stored when restarted.
+    """
+
+    COLUMNS = OutcomeCache.COLUMNS
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, params TEXT NOT NULL, team TEXT NOT NULL, wave INTEGER NOT NULL, "
+            "seed_start INTEGER NOT NULL, seed_stop INTEGER NOT NULL, "
+            + ", ".join(f"{column} INTEGER NOT NULL" for column in self.COLUMNS) + ")"
+        )
+        self.connection.commit()
+
+    def finished_keys(self) -> set:
+        return {row[0] for row in self.connection.execute("SELECT key FROM results")}
+
+    def add(self, task: SweepTask, result: SimulationResult) -> None:
+        values = [task.key, json.dumps(dict(task.params)), ",".join(task.team), task.wave_number,
+                  task.seed_start, task.seed_stop] + [getattr(result, column) for column in self.COLUMNS]
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO results VALUES ({', '.join('?' * len(values))})", values)
+        self.connection.commit()
+
+    def results(self) -> List[Tuple[Dict[str, Number], int, SimulationResult]]:
+        """Every stored (params, wave, result), in insertion order"""
+        rows = self.connection.execute(
+            f"SELECT params, wave, {', '.join(self.COLUMNS)} FROM results ORDER BY rowid")
+        stored = []
+        for params, wave, *totals in rows:
+            result = SimulationResult()
+            for column, value in zip(self.COLUMNS, totals):
+                setattr(result, column, value)
+            stored.append((json.loads(params), wave, result))
+        return stored
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def run_sweep(points: Iterable[Tuple[Tuple[str, Number], ...]], team: Sequence[str],
+              waves: Sequence[int], seeds: range, store: SweepStore,
+              workers: Optional[int] = None, on_result=None,
+              cache: Optional[OutcomeCache] = None) -> int:
+    """
+    Run every point against every wave for each seed in seeds, storing each task's
+    result as soon as it finishes. Tasks already in the store are skipped, and with
+    a cache, tasks whose content was simulated before (by any sweep) are not rerun.
+    Returns the number of tasks run.
+    """
+    registry = get_registry()
+    finished = store.finished_keys()
+    tasks = []
+    for params in points:
+        # Fail early on invalid values instead of in a worker
+        point_registry = apply_parameters(registry, params)
+        for wave_number in waves:
+            signature = wave_signature(team, wave_number, seeds, registry=point_registry)
+            key = task_key(params, signature)
+            if key not in finished:
+                finished.add(key)
+                tasks.append(SweepTask(key, signature, params, tuple(team), wave_number,
+                                       seeds.start, seeds.stop))
+
+    # Points that leave the content unchanged for a task (e.g. a class not in the team)
+    # share its signature and outcome, so only the first of them is simulated
+    same_content: Dict[str, List[SweepTask]] = {}
+    for task in tasks:
+        same_content.setdefault(task.signature, []).append(task)
+
+    def collect(task: SweepTask, result: SimulationResult) -> None:
+        if cache is not None:
+            cache.put(task.signature, result)
+        for same in same_content[task.signature]:
+            store.add(same, result)
+            if on_result is not None:
+                on_result(same, result)
+
+    tasks = [group[0] for group in same_content.values()]
+    if cache is not None:
+        pending = []
+        for task in tasks:
+            cached = cache.get(task.signature)
+            if cached is None:
+                pending.append(task)
+            else:
+                collect(task, cached)
+        tasks = pending
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            collect(*run_task(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for future in as_completed([executor.submit(run_task, task) for task in tasks]):
+                collect(*future.result())
+    return len(tasks)
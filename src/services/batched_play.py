@@ -0,0 +1,49 @@
+from typing import Dict, List, Sequence, Tuple
+
+from src.model.Battle import Battle
+from src.model.Observation import Observation
+from src.model.Policy import Policy
+
+
+def run_battles_batched(battles: Sequence[Battle]) -> None:
+    """
+    Run battles to completion in lockstep, one turn of every unfinished battle per step.
+
+    Each step begins the current turn of every battle, then decides for all actors that
+    share a policy with a single act_batch call, so a vectorized policy evaluates the
+    turns of many battles at once. Actors without a policy use the scripted AI.
+    """
+    active = list(battles)
+    for battle in active:
+        if not battle.battle_started:
+            battle.begin_battle()
+
+    while active:
+        actors: List[Tuple[Battle, object]] = []
+        waiting: Dict[int, Tuple[Policy, List[int]]] = {}
+        choices: List[object] = []
+
+        for battle in active:
+            entity = battle.begin_turn()
+            actors.append((battle, entity))
+            if entity is not None and entity.policy is not None:
+                waiting.setdefault(id(entity.policy), (entity.policy, []))[1].append(len(choices))
+            choices.append(None if entity is None or entity.policy is not None
+                           else entity.select_ability(battle))
+
+        for policy, indices in waiting.values():
+            observations = [Observation(*actors[i]) for i in indices]
+            for i, action in zip(indices, policy.act_batch(observations)):
+                battle, entity = actors[i]
+                choices[i] = battle.decode_action(entity, action)
+
+        still_active = []
+        for (battle, entity), choice in zip(actors, choices):
+            if entity is not None:
+                battle.finish_turn(entity, *choice)
+            battle.advance_turn()
+            if battle.is_battle_over():
+                battle.end_battle()
+            else:
+                still_active.append(battle)
+        active = still_active
@@ -0,0 +1,338 @@
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from src.model.DamageType import DamageType
+from src.model.StatsModifier import StatsModifier
+from src.model.TargetType import TargetType
+
+DEFAULT_CONTENT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "content.json")
+
+# Bump when the compiled layout changes so stale caches are rebuilt
+REGISTRY_VERSION = 1
+
+# Stats in the order of the Entity constructor; jitter is drawn in this order too
+STATS = ("max_hp", "attack", "defense", "magic_attack", "magic_defense", "speed")
+
+
+class EffectSpec(NamedTuple):
+    name: str
+    duration: int
+    stats_modifier: Tuple[Tuple[str, float], ...]
+    dot_damage: int
+    dot_type: Optional[DamageType]
+    heal_per_turn: int
+    can_act: bool
+
+
+class AbilitySpec(NamedTuple):
+    key: str
+    name: str
+    cooldown: int
+    damage: int
+    damage_type: Optional[DamageType]
+    healing: int
+    target_type: TargetType
+    status_effect: Optional[str]
+    aoe_damage_reduction: float
+    description: str
+
+
+class ClassSpec(NamedTuple):
+    name: str
+    stats: Tuple[int, ...]
+    abilities: Tuple[str, ...]
+
+
+class EnemyTypeSpec(NamedTuple):
+    key: str
+    name: str
+    stats: Tuple[int, ...]
+    abilities: Tuple[str, ...]
+
+
+class EnemyGroupSpec(NamedTuple):
+    """count enemies named after name (with {n} = 1..count), stats drawn from base + jitter"""
+    name: str
+    count: int
+    stats: Tuple[int, ...]
+    jitter: Tuple[int, ...]
+    abilities: Tuple[str, ...]
+    aggression: float
+
+
+class ScaledWaveSpec(NamedTuple):
+    """Parameters of the generated waves that follow the hand-written ones"""
+    scale_divisor: float
+    base_enemy_count: int
+    enemy_types: Tuple[str, ...]
+    jitter: Tuple[int, ...]
+    aggression_base: float
+    aggression_per_wave: float
+    boss_names: Tuple[Tuple[str, str], ...]
+    boss_stats: Tuple[int, ...]
+    boss_abilities: Tuple[str, ...]
+    boss_scaled_abilities: Tuple[str, ...]
+    boss_aggression: float
+
+
+class ContentRegistry:
+    """
+    Read-only view of the game content: effects, abilities, player classes,
+    enemy types and wave templates, validated and compiled from a data file.
+    """
+
+    def __init__(self, compiled: Dict[str, Any]):
+        self.effects: Mapping[str, EffectSpec] = MappingProxyType(compiled["effects"])
+        self.abilities: Mapping[str, AbilitySpec] = MappingProxyType(compiled["abilities"])
+        self.ability_sets: Mapping[str, Tuple[str, ...]] = MappingProxyType(compiled["ability_sets"])
+        self.classes: Tuple[ClassSpec, ...] = compiled["classes"]
+        self.enemy_types: Mapping[str, EnemyTypeSpec] = MappingProxyType(compiled["enemy_types"])
+        self.waves: Tuple[Tuple[EnemyGroupSpec, ...], ...] = compiled["waves"]
+        self.scaled_waves: ScaledWaveSpec = compiled["scaled_waves"]
+        self.source_hash: str = compiled["source_hash"]
+        self._compiled = compiled
+
+    @property
+    def class_names(self) -> Tuple[str, ...]:
+        return tuple(spec.name for spec in self.classes)
+
+    def replace(self, **changes: Any) -> 'ContentRegistry':
+        """Copy of the registry with some compiled sections swapped out, e.g. for balance sweeps"""
+        compiled = dict(self._compiled)
+        for section, value in changes.items():
+            if section not in compiled:
+                raise ValueError(f"Unknown registry section: {section}")
+            compiled[section] = dict(value) if isinstance(value, Mapping) else value
+        return ContentRegistry(compiled)
+
+
+def _require(condition: bool, message: str) -> None:
+    if not condition:
+        raise ValueError(f"Invalid content: {message}")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _non_negative_int(value: Any, where: str) -> int:
+    _require(isinstance(value, int) and not isinstance(value, bool) and value >= 0,
+             f"{where} must be a non-negative integer")
+    return value
+
+
+def _number(value: Any, where: str, low: float = 0.0, high: Optional[float] = None) -> float:
+    in_range = _is_number(value) and value >= low and (high is None or value <= high)
+    bounds = f"between {low} and {high}" if high is not None else f"at least {low}"
+    _require(in_range, f"{where} must be a number {bounds}")
+    return value
+
+
+def _enum_value(enum_type, value: Any, where: str):
+    try:
+        return enum_type(value)
+    except ValueError:
+        valid = ", ".join(member.value for member in enum_type)
+        raise ValueError(f"Invalid content: {where} must be one of {valid}, got {value!r}") from None
+
+
+def _stat_tuple(stats: Any, where: str, default: Optional[int] = None) -> Tuple[int, ...]:
+    _require(isinstance(stats, dict), f"{where} must be an object")
+    unknown = set(stats) - set(STATS)
+    _require(not unknown, f"{where} has unknown stats {sorted(unknown)}")
+    values = []
+    for stat in STATS:
+        values.append(_non_negative_int(stats.get(stat, default), f"{where}.{stat}"))
+    return tuple(values)
+
+
+def _ability_refs(keys: Any, abilities: Mapping[str, AbilitySpec], where: str) -> Tuple[str, ...]:
+    _require(isinstance(keys, list), f"{where} must be a list of ability ids")
+    for key in keys:
+        _require(key in abilities, f"{where} references unknown ability {key!r}")
+    return tuple(keys)
+
+
+def _compile_effect(name: str, raw: Dict[str, Any]) -> EffectSpec:
+    where = f"effects.{name}"
+    _require(isinstance(raw.get("duration"), int) and raw["duration"] > 0, f"{where}.duration must be a positive integer")
+    modifier = raw.get("stats_modifier", {})
+    try:
+        StatsModifier.from_dict(modifier)
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid content: {where}.stats_modifier: {e}") from None
+    dot_damage = raw.get("dot_damage", 0)
+    dot_type = _enum_value(DamageType, raw["dot_type"], f"{where}.dot_type") if "dot_type" in raw else None
+    _require(dot_damage == 0 or dot_type is not None, f"{where} deals damage over time without a dot_type")
+    return EffectSpec(
+        name=name,
+        duration=raw["duration"],
+        stats_modifier=tuple(modifier.items()),
+        dot_damage=dot_damage,
+        dot_type=dot_type,
+        heal_per_turn=raw.get("heal_per_turn", 0),
+        can_act=raw.get("can_act", True),
+    )
+
+
+def _compile_ability(key: str, raw: Dict[str, Any], effects: Mapping[str, EffectSpec]) -> AbilitySpec:
+    where = f"abilities.{key}"
+    _require(isinstance(raw.get("name"), str), f"{where}.name is required")
+    cooldown = _non_negative_int(raw.get("cooldown"), f"{where}.cooldown")
+    damage = _non_negative_int(raw.get("damage", 0), f"{where}.damage")
+    healing = _non_negative_int(raw.get("healing", 0), f"{where}.healing")
+    aoe_damage_reduction = _number(raw.get("aoe_damage_reduction", 0.7), f"{where}.aoe_damage_reduction", high=1.0)
+    damage_type = _enum_value(DamageType, raw["damage_type"], f"{where}.damage_type") if "damage_type" in raw else None
+    _require(damage == 0 or damage_type is not None, f"{where} deals damage without a damage_type")
+    status_effect = raw.get("status_effect")
+    _require(status_effect is None or status_effect in effects, f"{where} references unknown effect {status_effect!r}")
+    return AbilitySpec(
+        key=key,
+        name=raw["name"],
+        cooldown=cooldown,
+        damage=damage,
+        damage_type=damage_type,
+        healing=healing,
+        target_type=_enum_value(TargetType, raw.get("target_type", TargetType.SINGLE.value), f"{where}.target_type"),
+        status_effect=status_effect,
+        aoe_damage_reduction=aoe_damage_reduction,
+        description=raw.get("description", ""),
+    )
+
+
+def _compile_group(raw: Dict[str, Any], enemy_types: Mapping[str, EnemyTypeSpec],
+                   abilities: Mapping[str, AbilitySpec], where: str) -> EnemyGroupSpec:
+    _require(raw.get("type") in enemy_types, f"{where}.type must be one of {sorted(enemy_types)}")
+    enemy_type = enemy_types[raw["type"]]
+    stats = _stat_tuple(raw["stats"], f"{where}.stats") if "stats" in raw else enemy_type.stats
+    group_abilities = (_ability_refs(raw["abilities"], abilities, f"{where}.abilities")
+                       if "abilities" in raw else enemy_type.abilities)
+    count = raw.get("count", 1)
+    _require(isinstance(count, int) and count > 0, f"{where}.count must be a positive integer")
+    return EnemyGroupSpec(
+        name=raw.get("name", enemy_type.name),
+        count=count,
+        stats=stats,
+        jitter=_stat_tuple(raw.get("jitter", {}), f"{where}.jitter", default=0),
+        abilities=group_abilities,
+        aggression=_number(raw.get("aggression", 0.7), f"{where}.aggression", high=1.0),
+    )
+
+
+def compile_content(raw: Dict[str, Any], source_hash: str = "") -> Dict[str, Any]:
+    """Validate the raw content document and compile it into lookup tables"""
+    for section in ("effects", "abilities", "ability_sets", "classes", "enemy_types", "waves", "scaled_waves"):
+        _require(section in raw, f"missing section {section!r}")
+
+    effects = {name: _compile_effect(name, spec) for name, spec in raw["effects"].items()}
+    abilities = {key: _compile_ability(key, spec, effects) for key, spec in raw["abilities"].items()}
+    ability_sets = {role: _ability_refs(keys, abilities, f"ability_sets.{role}")
+                    for role, keys in raw["ability_sets"].items()}
+
+    classes = []
+    for i, spec in enumerate(raw["classes"]):
+        where = f"classes[{i}]"
+        _require(isinstance(spec.get("name"), str), f"{where}.name is required")
+        classes.append(ClassSpec(spec["name"], _stat_tuple(spec.get("stats"), f"{where}.stats"),
+                                 _ability_refs(spec.get("abilities"), abilities, f"{where}.abilities")))
+    names = [spec.name for spec in classes]
+    _require(len(set(names)) == len(names), "class names must be unique")
+
+    enemy_types = {}
+    for key, spec in raw["enemy_types"].items():
+        where = f"enemy_types.{key}"
+        enemy_types[key] = EnemyTypeSpec(key, spec.get("name", key.capitalize()),
+                                         _stat_tuple(spec.get("stats"), f"{where}.stats"),
+                                         _ability_refs(spec.get("abilities"), abilities, f"{where}.abilities"))
+
+    waves = tuple(
+        tuple(_compile_group(group, enemy_types, abilities, f"waves[{i}][{j}]") for j, group in enumerate(wave))
+        for i, wave in enumerate(raw["waves"])
+    )
+
+    scaled = raw["scaled_waves"]
+    _require(isinstance(scaled, dict), "scaled_waves must be an object")
+    boss = scaled.get("boss")
+    _require(isinstance(boss, dict), "scaled_waves.boss must be an object")
+    boss_names = boss.get("names")
+    _require(isinstance(boss_names, dict), "scaled_waves.boss.names must map enemy types to boss names")
+    scale_divisor = scaled.get("scale_divisor")
+    _require(_is_number(scale_divisor) and scale_divisor > 0, "scaled_waves.scale_divisor must be positive")
+    _require(isinstance(scaled.get("enemy_types"), list) and scaled["enemy_types"],
+             "scaled_waves.enemy_types must not be empty")
+    for key in scaled["enemy_types"]:
+        _require(key in enemy_types, f"scaled_waves.enemy_types references unknown enemy type {key!r}")
+        _require(isinstance(boss_names.get(key), str), f"scaled_waves.boss.names has no name for {key!r}")
+    scaled_waves = ScaledWaveSpec(
+        scale_divisor=scale_divisor,
+        base_enemy_count=_non_negative_int(scaled.get("base_enemy_count"), "scaled_waves.base_enemy_count"),
+        enemy_types=tuple(scaled["enemy_types"]),
+        jitter=_stat_tuple(scaled.get("jitter", {}), "scaled_waves.jitter", default=0),
+        aggression_base=_number(scaled.get("aggression_base"), "scaled_waves.aggression_base"),
+        aggression_per_wave=_number(scaled.get("aggression_per_wave"), "scaled_waves.aggression_per_wave"),
+        boss_names=tuple(boss_names.items()),
+        boss_stats=_stat_tuple(boss.get("stats"), "scaled_waves.boss.stats"),
+        boss_abilities=_ability_refs(boss.get("abilities", []), abilities, "scaled_waves.boss.abilities"),
+        boss_scaled_abilities=_ability_refs(boss.get("scaled_abilities", []), abilities,
+                                            "scaled_waves.boss.scaled_abilities"),
+        boss_aggression=_number(boss.get("aggression", 0.8), "scaled_waves.boss.aggression", high=1.0),
+    )
+
+    return {
+        "effects": effects,
+        "abilities": abilities,
+        "ability_sets": ability_sets,
+        "classes": tuple(classes),
+        "enemy_types": enemy_types,
+        "waves": waves,
+        "scaled_waves": scaled_waves,
+        "source_hash": source_hash,
+    }
+
+
+def cache_path_for(path: str) -> str:
+    return f"{path}.cache"
+
+
+def load_registry(path: str = DEFAULT_CONTENT_PATH, use_cache: bool = True) -> ContentRegistry:
+    """
+    Load the content file, reusing the compiled registry cached next to it
+    when the file has not changed since it was compiled.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    source_hash = hashlib.sha256(data).hexdigest()
+    cache_path = cache_path_for(path)
+
+    if use_cache:
+        try:
+            with open(cache_path, "rb") as f:
+                version, cached_hash, compiled = pickle.load(f)
+            if version == REGISTRY_VERSION and cached_hash == source_hash:
+                return ContentRegistry(compiled)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError, ImportError):
+            pass
+
+    compiled = compile_content(json.loads(data), source_hash)
+
+    if use_cache:
+        try:
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump((REGISTRY_VERSION, source_hash, compiled), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # A read-only install just recompiles on every start
+
+    return ContentRegistry(compiled)
+
+
+@lru_cache(maxsize=None)
+def get_registry() -> ContentRegistry:
+    """Registry of the bundled content, loaded once per process"""
+    return load_registry()
@@ -1,4 +1,6 @@
+from src.model.SpriteAtlas import SpriteAtlas
 from src.services.create_placeholder import create_placeholder_sprite
+from src.services.sprite_sheets import DEFAULT_SPRITE_DIR, load_sheet_atlas
 
 
 def create_entity_sprites(font):
@@ -39,3 +41,22 @@ def create_entity_sprites(font):
     
     return entity_sprites
 
+
+
+def create_sprite_atlas(font, sprite_dir: str = DEFAULT_SPRITE_DIR) -> SpriteAtlas:
+    """
+    Atlas of the placeholder sprites and of every sprite sheet in sprite_dir, converted
+    to the display format. Sheet sprites replace placeholders of the same name, along
+    with the aliases of that placeholder (a "Wolf" sprite is used for "Wolf 1" too).
+    Needs the display to be initialized.
+    """
+    sprites = create_entity_sprites(font)
+    sheet_atlas = load_sheet_atlas(sprite_dir)
+    if sheet_atlas is not None:
+        for name, sprite in sheet_atlas.sprites.items():
+            placeholder = sprites.get(name)
+            for alias, surface in list(sprites.items()):
+                if placeholder is not None and surface is placeholder:
+                    sprites[alias] = sprite
+            sprites[name] = sprite
+    return SpriteAtlas.pack(sprites).convert()
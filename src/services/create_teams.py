@@ -0,0 +1,87 @@
+import random
+from typing import Dict, List, Optional
+
+from src.abilities.abilities import create_ability
+from src.model.AbilityDefinition import AbilityDefinition
+from src.model.Enemy import Enemy
+from src.model.Player import Player
+from src.services.content_registry import ContentRegistry, get_registry
+
+
+def create_player_team(abilities: Dict[str, AbilityDefinition],
+                       registry: Optional[ContentRegistry] = None) -> List[Player]:
+    """Create the full roster of player characters"""
+    registry = registry or get_registry()
+    players = []
+
+    for spec in registry.classes:
+        players.append(Player(
+            spec.name,
+            *spec.stats,
+            abilities=[abilities[key] for key in spec.abilities]
+        ))
+
+    return players
+
+
+def _jittered_stats(base_stats, jitter, rng, scale: float = 1) -> List[int]:
+    """Stats in constructor order; jitter is drawn stat by stat, skipping stats without jitter"""
+    stats = []
+    for base, spread in zip(base_stats, jitter):
+        value = int(base * scale)
+        if spread:
+            value += rng.randint(-spread, spread)
+        stats.append(value)
+    return stats
+
+
+def create_enemy_wave(abilities: Dict[str, AbilityDefinition], wave_number: int,
+                      rng: Optional[random.Random] = None,
+                      registry: Optional[ContentRegistry] = None) -> List[Enemy]:
+    """Create a wave of enemies, drawing stat jitter from rng (the global random module by default)"""
+    if rng is None:
+        rng = random
+    registry = registry or get_registry()
+    enemies = []
+
+    if wave_number <= len(registry.waves):
+        # Hand-written waves: groups of regular enemies followed by their leader
+        for group in registry.waves[wave_number - 1]:
+            for n in range(1, group.count + 1):
+                enemies.append(Enemy(
+                    group.name.format(n=n),
+                    *_jittered_stats(group.stats, group.jitter, rng),
+                    abilities=[abilities[key] for key in group.abilities],
+                    aggression=group.aggression
+                ))
+        return enemies
+
+    # Harder waves: mixed enemies with increasing stats
+    scaled = registry.scaled_waves
+    scale_factor = wave_number / scaled.scale_divisor
+    # Gets more aggressive with higher waves
+    aggression = scaled.aggression_base + (wave_number - len(registry.waves)) * scaled.aggression_per_wave
+
+    for i in range(scaled.base_enemy_count + wave_number):
+        enemy_type = registry.enemy_types[rng.choice(scaled.enemy_types)]
+        enemies.append(Enemy(
+            f"{enemy_type.name} {i+1}",
+            *_jittered_stats(enemy_type.stats, scaled.jitter, rng, scale_factor),
+            abilities=[abilities[key] for key in enemy_type.abilities],
+            aggression=aggression
+        ))
+
+    # Add a boss appropriate to the wave number, with significantly higher stats,
+    # abilities from all types and unique abilities that scale with the wave
+    boss_type = scaled.enemy_types[wave_number % len(scaled.enemy_types)]
+    boss_abilities = [abilities[key] for key in scaled.boss_abilities]
+    boss_abilities.extend(create_ability(registry.abilities[key], registry, scale_factor)
+                          for key in scaled.boss_scaled_abilities)
+    enemies.append(Enemy(
+        dict(scaled.boss_names)[boss_type].format(wave=wave_number),
+        *[int(stat * scale_factor) for stat in scaled.boss_stats],
+        abilities=boss_abilities,
+        aggression=scaled.boss_aggression
+    ))
+
+    return enemies
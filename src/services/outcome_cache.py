@@ -0,0 +1,120 @@
+import enum
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Optional, Sequence, Set
+
+from src.model.SimulationResult import SimulationResult
+from src.services.content_registry import REGISTRY_VERSION, ContentRegistry, get_registry
+
+# Bump whenever battle rules change in code (damage formulas, AI, turn order, RNG use),
+# so results simulated by an older engine are not reused
+ENGINE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+def _json_default(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot hash {type(value).__name__} in a wave signature")
+
+
+def wave_signature(team: Sequence[str], wave_number: int, seeds: range, engine: str = "object",
+                   registry: Optional[ContentRegistry] = None) -> str:
+    """
+    Stable hash of everything the outcome of a team against a wave depends on: the stats
+    and abilities of the team's classes, the enemies the wave can spawn and their
+    abilities, the status effects those abilities apply, the wave number, the seed range
+    and the engine. Content the battles cannot reach is left out, so changing one class
+    only changes the signature of the teams that include it.
+    """
+    registry = registry or get_registry()
+    classes = {spec.name: spec for spec in registry.classes}
+    team_specs = [classes[name] for name in team]
+    ability_keys: Set[str] = {key for spec in team_specs for key in spec.abilities}
+
+    if wave_number <= len(registry.waves):
+        wave = registry.waves[wave_number - 1]
+        ability_keys.update(key for group in wave for key in group.abilities)
+    else:
+        scaled = registry.scaled_waves
+        enemy_types = [registry.enemy_types[key] for key in scaled.enemy_types]
+        ability_keys.update(key for spec in enemy_types for key in spec.abilities)
+        ability_keys.update(scaled.boss_abilities + scaled.boss_scaled_abilities)
+        # Aggression of generated waves counts from the number of hand-written ones
+        wave = (scaled, enemy_types, len(registry.waves))
+
+    abilities = {key: registry.abilities[key] for key in sorted(ability_keys)}
+    effects = {spec.status_effect: registry.effects[spec.status_effect]
+               for spec in abilities.values() if spec.status_effect}
+    payload = json.dumps(
+        [ENGINE_VERSION, REGISTRY_VERSION, engine, team_specs, wave_number, wave,
+         abilities, effects, seeds.start, seeds.stop],
+        sort_keys=True, default=_json_default)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class OutcomeCache:
+    """
+    Persistent SQLite cache of aggregated wave outcomes, keyed by wave_signature().
+
+    Entries are evicted least recently used first once there are more than max_entries.
+    hits and misses count lookups since the cache was opened.
+    """
+
+    COLUMNS = ("battles", "player_wins", "enemy_wins", "total_rounds", "total_turns",
+               "player_damage", "enemy_damage", "player_healing", "enemy_healing")
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS outcomes (key TEXT PRIMARY KEY, last_used REAL NOT NULL, "
+            + ", ".join(f"{column} INTEGER NOT NULL" for column in self.COLUMNS) + ")"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS outcomes_last_used ON outcomes (last_used)")
+        self.connection.commit()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM outcomes").fetchone()[0]
+
+    def get(self, key: str) -> Optional[SimulationResult]:
+        row = self.connection.execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM outcomes WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.connection.execute("UPDATE outcomes SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.connection.commit()
+        result = SimulationResult()
+        for column, value in zip(self.COLUMNS, row):
+            setattr(result, column, value)
+        return result
+
+    def put(self, key: str, result: SimulationResult) -> None:
+        values = [key, time.time()] + [getattr(result, column) for column in self.COLUMNS]
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO outcomes VALUES ({', '.join('?' * len(values))})", values)
+        self._evict()
+        self.connection.commit()
+
+    def _evict(self) -> None:
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM outcomes WHERE key IN "
+                "(SELECT key FROM outcomes ORDER BY last_used LIMIT ?)", (excess,))
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM outcomes")
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,87 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.abilities.abilities import create_abilities
+from src.model.BattleRecord import BattleRecord
+from src.model.SimulationResult import SimulationResult
+from src.services.create_teams import create_player_team
+from src.services.outcome_cache import OutcomeCache, wave_signature
+from src.services.simulate_battles import run_wave_battle
+
+# A shard is a contiguous range of seeds for one team/wave combination
+Shard = Tuple[Tuple[str, ...], int, int, int]
+
+
+def all_team_compositions(team_size: int = 4) -> List[Tuple[str, ...]]:
+    """Every team of team_size characters that can be picked from the player roster"""
+    names = [player.name for player in create_player_team(create_abilities())]
+    return list(itertools.combinations(names, team_size))
+
+
+def make_shards(teams: Iterable[Sequence[str]], waves: Iterable[int],
+                seeds: range, shard_size: int) -> List[Shard]:
+    """Split every team/wave/seed combination into shards of at most shard_size battles"""
+    shards = []
+    for team in teams:
+        for wave_number in waves:
+            for start in range(seeds.start, seeds.stop, shard_size):
+                shards.append((tuple(team), wave_number, start, min(start + shard_size, seeds.stop)))
+    return shards
+
+
+def run_shard(shard: Shard) -> List[BattleRecord]:
+    """Worker entry point: run every battle of a shard and return compact records"""
+    team, wave_number, seed_start, seed_stop = shard
+    return [
+        BattleRecord.from_battle(run_wave_battle(team, wave_number, seed), team, wave_number, seed)
+        for seed in range(seed_start, seed_stop)
+    ]
+
+
+def run_parallel_sweep(teams: Iterable[Sequence[str]], waves: Iterable[int], seeds: range,
+                       workers: Optional[int] = None,
+                       shard_size: int = 250,
+                       cache: Optional[OutcomeCache] = None) -> Dict[Tuple[Tuple[str, ...], int], SimulationResult]:
+    """
+    Simulate every team against every wave for each seed in seeds, spread over
+    a process pool. Each battle is seeded by its own seed, so the aggregated
+    results do not depend on the number of workers or the shard size.
+    With a cache, team/wave combinations simulated before are read from it
+    and the new ones are added to it.
+    """
+    results: Dict[Tuple[Tuple[str, ...], int], SimulationResult] = {}
+    signatures: Dict[Tuple[Tuple[str, ...], int], str] = {}
+    missing = [(tuple(team), wave_number) for team in teams for wave_number in waves]
+    if cache is not None:
+        for key in missing:
+            signatures[key] = wave_signature(key[0], key[1], seeds)
+            cached = cache.get(signatures[key])
+            if cached is not None:
+                results[key] = cached
+        missing = [key for key in missing if key not in results]
+    
+    shards = [shard for team, wave_number in missing
+              for shard in make_shards([team], [wave_number], seeds, shard_size)]
+    
+    def collect(records: List[BattleRecord]) -> None:
+        for record in records:
+            key = (record.team, record.wave_number)
+            if key not in results:
+                results[key] = SimulationResult()
+            results[key].add_record(record)
+    
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for shard in shards:
+            collect(run_shard(shard))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for records in executor.map(run_shard, shards):
+                collect(records)
+    
+    if cache is not None:
+        for key in missing:
+            cache.put(signatures[key], results.get(key, SimulationResult()))
+    return results
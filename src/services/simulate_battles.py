@@ -0,0 +1,72 @@
+import copy
+import random
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from src.abilities.abilities import create_abilities
+from src.model.AbilityDefinition import AbilityDefinition
+from src.model.Battle import Battle
+from src.model.Enemy import Enemy
+from src.model.Player import Player
+from src.model.SimulationResult import SimulationResult
+from src.services.content_registry import ContentRegistry
+from src.services.create_teams import create_enemy_wave, create_player_team
+
+
+def run_battle(players: List[Player], enemies: List[Enemy],
+               rng: Optional[random.Random] = None) -> Battle:
+    """Run a single battle to completion without delays or rendering"""
+    battle = Battle(players, enemies, delay=0, rng=rng, record_log=False)
+    battle.start_battle()
+    return battle
+
+
+def simulate_battles(players: List[Player], enemies: List[Enemy],
+                     n: int, seed: int = 0) -> SimulationResult:
+    """
+    Run n battles between copies of the given rosters.
+    Battle i is seeded with seed + i so results are reproducible.
+    """
+    result = SimulationResult()
+    
+    for i in range(n):
+        # Rosters are mutated during a battle, so every run gets fresh copies
+        battle_players, battle_enemies = copy.deepcopy((players, enemies))
+        result.record(run_battle(battle_players, battle_enemies, random.Random(seed + i)))
+    
+    return result
+
+
+@lru_cache(maxsize=8)
+def shared_abilities(registry: Optional[ContentRegistry] = None) -> Dict[str, AbilityDefinition]:
+    """
+    Ability definitions of a registry, built once and reused by every battle.
+    Definitions are immutable and effect templates are copied onto their targets,
+    so battles cannot affect each other through them.
+    """
+    return create_abilities(registry)
+
+
+def run_wave_battle(team: Sequence[str], wave_number: int, seed: int,
+                    registry: Optional[ContentRegistry] = None) -> Battle:
+    """Build the named team and a generated wave, then run one battle seeded with seed"""
+    rng = random.Random(seed)
+    abilities = shared_abilities(registry)
+    roster = {player.name: player for player in create_player_team(abilities, registry)}
+    players = [roster[name] for name in team]
+    enemies = create_enemy_wave(abilities, wave_number, rng, registry)
+    return run_battle(players, enemies, rng)
+
+
+def simulate_wave(team: Sequence[str], wave_number: int,
+                  n: int, seed: int = 0) -> SimulationResult:
+    """
+    Run n battles of the named player team against a generated enemy wave.
+    The wave is regenerated for every battle so stat jitter is sampled too.
+    """
+    result = SimulationResult()
+    
+    for i in range(n):
+        result.record(run_wave_battle(team, wave_number, seed + i))
+    
+    return result
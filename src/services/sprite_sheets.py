@@ -0,0 +1,101 @@
+import glob
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+import pygame
+
+from src.model.SpriteAtlas import SpriteAtlas
+
+DEFAULT_SPRITE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "sprites")
+
+# Bump when the cached atlas layout changes so stale caches are rebuilt
+SHEET_CACHE_VERSION = 1
+CACHE_IMAGE = ".atlas-cache.png"
+CACHE_INDEX = ".atlas-cache.json"
+
+
+def _manifests(directory: str):
+    return sorted(glob.glob(os.path.join(directory, "*.json")))
+
+
+def _read_manifest(path: str) -> dict:
+    with open(path) as f:
+        manifest = json.load(f)
+    where = os.path.basename(path)
+    if not isinstance(manifest.get("image"), str):
+        raise ValueError(f"Invalid sprite sheet {where}: 'image' must be a file name")
+    frames = manifest.get("frames")
+    if not isinstance(frames, dict) or not frames:
+        raise ValueError(f"Invalid sprite sheet {where}: 'frames' must map sprite names to [x, y, width, height]")
+    for name, rect in frames.items():
+        if not (isinstance(rect, list) and len(rect) == 4 and all(isinstance(v, int) and v >= 0 for v in rect)):
+            raise ValueError(f"Invalid sprite sheet {where}: frame {name!r} must be [x, y, width, height]")
+    return manifest
+
+
+def sheets_hash(directory: str) -> Optional[str]:
+    """Hash of every manifest and the images they use, None when there are no sheets"""
+    manifests = _manifests(directory)
+    if not manifests:
+        return None
+    digest = hashlib.sha256()
+    for path in manifests:
+        manifest = _read_manifest(path)
+        for file_path in (path, os.path.join(directory, manifest["image"])):
+            digest.update(os.path.basename(file_path).encode())
+            with open(file_path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def load_sprite_sheets(directory: str) -> Dict[str, pygame.Surface]:
+    """
+    Cut the sprites out of every sheet in directory. Each sheet is an image plus a JSON
+    manifest next to it: {"image": "wolves.png", "frames": {"Wolf": [x, y, width, height], ...}}
+    """
+    sprites: Dict[str, pygame.Surface] = {}
+    for path in _manifests(directory):
+        manifest = _read_manifest(path)
+        sheet = pygame.image.load(os.path.join(directory, manifest["image"]))
+        bounds = sheet.get_rect()
+        for name, rect in manifest["frames"].items():
+            if not bounds.contains(pygame.Rect(rect)):
+                raise ValueError(f"Invalid sprite sheet {os.path.basename(path)}: frame {name!r} "
+                                 f"is outside {manifest['image']}")
+            sprites[name] = sheet.subsurface(rect)
+    return sprites
+
+
+def load_sheet_atlas(directory: str = DEFAULT_SPRITE_DIR, use_cache: bool = True) -> Optional[SpriteAtlas]:
+    """
+    Sprites of every sheet in directory packed into one atlas, or None when there are
+    no sheets. The packed atlas is cached in the directory and reused until a manifest
+    or image changes, so a start loads one image instead of every sheet.
+    """
+    if not os.path.isdir(directory):
+        return None
+    source_hash = sheets_hash(directory)
+    if source_hash is None:
+        return None
+    image_path = os.path.join(directory, CACHE_IMAGE)
+    index_path = os.path.join(directory, CACHE_INDEX)
+
+    if use_cache:
+        try:
+            atlas, metadata = SpriteAtlas.load(image_path, index_path)
+            if metadata.get("version") == SHEET_CACHE_VERSION and metadata.get("hash") == source_hash:
+                return atlas
+        except (OSError, ValueError, KeyError, pygame.error):
+            pass
+
+    atlas = SpriteAtlas.pack(load_sprite_sheets(directory))
+
+    if use_cache:
+        try:
+            atlas.save(image_path, index_path, version=SHEET_CACHE_VERSION, hash=source_hash)
+        except (OSError, pygame.error):
+            pass  # A read-only install just repacks on every start
+
+    return atlas
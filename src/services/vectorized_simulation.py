@@ -0,0 +1,88 @@
+import math
+import random
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.abilities.abilities import create_abilities
+from src.model.BattleRecord import BattleRecord
+from src.model.EntityType import EntityType
+from src.model.SimulationResult import SimulationResult
+from src.model.VectorBattle import VectorBattle
+from src.services.create_teams import create_enemy_wave, create_player_team
+from src.services.simulate_battles import run_wave_battle
+
+
+def build_wave_rosters(team: Sequence[str], wave_number: int, n: int, seed: int = 0) -> list:
+    """Build n (players, enemies) rosters, wave i generated from seed + i like simulate_wave"""
+    rosters = []
+    for i in range(n):
+        rng = random.Random(seed + i)
+        abilities = create_abilities()
+        roster = {player.name: player for player in create_player_team(abilities)}
+        players = [roster[name] for name in team]
+        rosters.append((players, create_enemy_wave(abilities, wave_number, rng)))
+    return rosters
+
+
+def result_from_vector_battle(battle: VectorBattle) -> SimulationResult:
+    """Aggregate the outcomes of every battle of a finished VectorBattle"""
+    result = SimulationResult()
+    wins = battle.winners()
+    result.battles = battle.k
+    result.player_wins = int(wins.sum())
+    result.enemy_wins = battle.k - result.player_wins
+    result.total_rounds = int(battle.round_number.sum())
+    result.total_turns = int(battle.turns_taken.sum())
+    result.player_damage = int(battle.damage_by_side(EntityType.PLAYER).sum())
+    result.enemy_damage = int(battle.damage_by_side(EntityType.ENEMY).sum())
+    result.player_healing = int(battle.healing_done[:, 0].sum())
+    result.enemy_healing = int(battle.healing_done[:, 1].sum())
+    return result
+
+
+def simulate_wave_vectorized(team: Sequence[str], wave_number: int,
+                             n: int, seed: int = 0) -> SimulationResult:
+    """Vectorized counterpart of simulate_wave, running all n battles in one VectorBattle"""
+    battle = VectorBattle(build_wave_rosters(team, wave_number, n, seed), seed=seed)
+    battle.run()
+    return result_from_vector_battle(battle)
+
+
+def cross_check(team: Sequence[str], wave_number: int, n: int, seed: int = 0,
+                z: float = 4.0) -> Tuple[SimulationResult, SimulationResult, List[str]]:
+    """
+    Run the same team and wave through the object engine and the vectorized engine
+    and compare their per-battle outcomes. A metric mismatches when the two means
+    differ by more than z combined standard errors.
+    Returns both aggregated results and the list of mismatching metrics.
+    """
+    object_result = SimulationResult()
+    records = []
+    for i in range(n):
+        record = BattleRecord.from_battle(run_wave_battle(team, wave_number, seed + i))
+        object_result.add_record(record)
+        records.append(record)
+
+    battle = VectorBattle(build_wave_rosters(team, wave_number, n, seed), seed=seed)
+    battle.run()
+    vector_result = result_from_vector_battle(battle)
+
+    samples = {
+        "win rate": ([r.player_won for r in records], battle.winners()),
+        "rounds": ([r.rounds for r in records], battle.round_number),
+        "turns": ([r.turns for r in records], battle.turns_taken),
+        "player damage": ([r.player_damage for r in records], battle.damage_by_side(EntityType.PLAYER)),
+        "enemy damage": ([r.enemy_damage for r in records], battle.damage_by_side(EntityType.ENEMY)),
+    }
+
+    mismatches = []
+    for name, (expected, actual) in samples.items():
+        expected = np.asarray(expected, dtype=np.float64)
+        actual = np.asarray(actual, dtype=np.float64)
+        error = math.sqrt(expected.var() / n + actual.var() / n)
+        # Floor the error so identical constant samples do not demand exact equality
+        if abs(expected.mean() - actual.mean()) > z * max(error, 1 / n):
+            mismatches.append(f"{name}: {expected.mean():.3f} vs {actual.mean():.3f}")
+
+    return object_result, vector_result, mismatches
@@ -0,0 +1,70 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from src.services.balance_sweep import SweepStore, grid_points, parse_parameter, random_points, run_sweep
+from src.services.outcome_cache import OutcomeCache
+
+DEFAULT_TEAM = ["Warrior", "Mage", "Healer", "Rogue"]
+
+
+def format_params(params) -> str:
+    return " ".join(f"{name}={value}" for name, value in params)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sweep balance parameters and store the simulated outcomes",
+        epilog="Parameters: class.<Class>.<stat>, ability.<id>.<cooldown|damage|healing|aoe_damage_reduction>, "
+               "wave.<scale_divisor|base_enemy_count|aggression_base|aggression_per_wave|boss_aggression>. "
+               "Example: --param class.Warrior.attack=20,25,30 --param wave.scale_divisor=2.5:3.5 --samples 50")
+    parser.add_argument("--param", action="append", required=True,
+                        help="name=v1,v2,... for grid values or name=low:high for a random search range")
+    parser.add_argument("--samples", type=int, default=0,
+                        help="Draw this many random points instead of running the full grid")
+    parser.add_argument("--sweep-seed", type=int, default=0, help="Seed of the random points")
+    parser.add_argument("--team", nargs="+", default=DEFAULT_TEAM, help="Names of the player characters")
+    parser.add_argument("--waves", type=int, nargs="+", default=[1], help="Wave numbers to simulate")
+    parser.add_argument("--battles", type=int, default=1000, help="Number of battles per point and wave")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first battle")
+    parser.add_argument("--workers", type=int, default=0, help="Number of worker processes (0 for one per core)")
+    parser.add_argument("--db", default="sweep.sqlite", help="Result store; finished points are not rerun")
+    parser.add_argument("--cache", help="Outcome cache shared with other sweeps and simulate.py")
+    args = parser.parse_args()
+
+    try:
+        parameters = [parse_parameter(text) for text in args.param]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.samples:
+        points = list(random_points(parameters, args.samples, args.sweep_seed))
+    else:
+        ranges = [parameter.name for parameter in parameters if not parameter.values]
+        if ranges:
+            parser.error(f"Range parameters need --samples: {', '.join(ranges)}")
+        points = list(grid_points(parameters))
+
+    def report(task, result):
+        print(f"wave {task.wave_number} | {format_params(task.params)} | "
+              f"win rate {result.win_rate:.2%} | rounds {result.average_rounds:.2f}", flush=True)
+
+    store = SweepStore(args.db)
+    cache = OutcomeCache(args.cache) if args.cache else None
+    try:
+        seeds = range(args.seed, args.seed + args.battles)
+        ran = run_sweep(points, args.team, args.waves, seeds, store,
+                        workers=args.workers or None, on_result=report, cache=cache)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        store.close()
+        if cache is not None:
+            print(f"Outcome cache: {cache.hits} hits, {cache.misses} misses")
+            cache.close()
+    skipped = len(points) * len(args.waves) - ran
+    print(f"{ran} tasks simulated, {skipped} reused")
+
+
+if __name__ == "__main__":
+    main()
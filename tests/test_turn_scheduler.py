@@ -0,0 +1,45 @@
+import unittest
+
+from src.model.Battle import Battle
+from src.model.DamageType import DamageType
+from src.model.Enemy import Enemy
+from src.model.Player import Player
+from src.model.StatusEffect import StatusEffect
+from src.model.TurnScheduler import TurnScheduler
+
+
+def sturdy(cls, name: str, speed: int, max_hp: int = 1000):
+    # Defense this high turns every basic attack into 1 damage
+    return cls(name, max_hp, 0, 10000, 0, 10000, speed)
+
+
+class AtbTurnOrderTest(unittest.TestCase):
+    def test_actor_dying_on_its_own_turn_does_not_skip_the_next_actor(self):
+        fast = sturdy(Player, "A", 50, max_hp=100)
+        slow = sturdy(Player, "A2", 20)
+        enemies = [sturdy(Enemy, "B", 40), sturdy(Enemy, "C", 30)]
+        # Ticks at A's turns t=2, 4 and 6, the third one kills it
+        fast.add_status_effect(StatusEffect("Poison", 10, dot_damage=40, dot_type=DamageType.TRUE))
+        battle = Battle([fast, slow], enemies, delay=0, seed=0, record_log=False,
+                        turn_mode=TurnScheduler.ATB)
+        battle.begin_battle()
+
+        actors = []
+        for _ in range(10):
+            actors.append((battle.current_entity.name, round(battle.scheduler.time, 2)))
+            battle.next_turn()
+
+        self.assertFalse(fast.is_alive)
+        self.assertEqual(actors, [("A", 2.0), ("B", 2.5), ("C", 3.33), ("A", 4.0), ("A2", 5.0),
+                                  ("B", 5.0), ("A", 6.0), ("C", 6.67), ("B", 7.5), ("A2", 10.0)])
+
+    def test_rounds_stop_counting_when_nobody_has_speed(self):
+        battle = Battle([sturdy(Player, "A", 0)], [sturdy(Enemy, "B", 0)], delay=0, seed=0,
+                        record_log=False, turn_mode=TurnScheduler.ATB)
+        battle.begin_battle()
+        battle.next_turn()
+        self.assertEqual(battle.round_number, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()